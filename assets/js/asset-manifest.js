@@ -0,0 +1,27 @@
+'use strict';
+
+// Logical asset paths (relative to the site root) -> content-hashed files
+// written by scripts/build_manifest.py. A plain checkout has no manifest, so
+// every path resolves to itself.
+var assetManifest = {};
+
+function assetUrl(path) {
+    if (Object.prototype.hasOwnProperty.call(assetManifest, path)) {
+        return '../' + assetManifest[path];
+    }
+    return '../' + path;
+}
+
+function load_asset_manifest(rootUrl) {
+    return $.getJSON(rootUrl + 'asset-manifest.json')
+        .done(function(jsonData) {
+            assetManifest = jsonData.assets || {};
+        })
+        .fail(function() {
+            assetManifest = {};
+        });
+}
+
+if ($.views) {
+    $.views.helpers({ asset: assetUrl });
+}
@@ -57,17 +57,30 @@ function init_nodestatus(area) {
     });
 }
 
+function _chartNode(chart, name) {
+    // nodeHTMLid -> nodeDB item, rebuilt whenever the tree gets a new nodeDB.
+    var db = chart.tree.nodeDB.db;
+    if(chart.nodeIndexDB !== db) {
+        chart.nodeIndex = {};
+        chart.nodeIndexDB = db;
+        for(const item of db) {
+            if(item.nodeHTMLid) chart.nodeIndex[item.nodeHTMLid] = item;
+        }
+    }
+    return Object.prototype.hasOwnProperty.call(chart.nodeIndex, name) ? chart.nodeIndex[name] : null;
+}
+
 function getNodeDBNode(area, name) {
-    for(const item of charts[area].tree.nodeDB.db) {
-        if(item.nodeHTMLid === name) return item;
+    if(charts[area]) {
+        var item = _chartNode(charts[area], name);
+        if(item !== null) return item;
     }
     // Didn't find in the area charts - maybe it's in another one ?
     // (see Science Nexus and other Mega Structure in Engineering tree)
     for(const tree in charts) {
         if(tree === area) continue;
-        for(const item of charts[tree].tree.nodeDB.db) {
-            if(item.nodeHTMLid === name) return item;
-        }
+        var other = _chartNode(charts[tree], name);
+        if(other !== null) return other;
     }
     return null;
 }
@@ -92,7 +105,9 @@ function updateResearch(area, name, active) {
         if(myConnector !== undefined) $(myConnector).addClass("active");
 
         for(const child of inode.children) {
-            $(charts[area].tree.nodeDB.db[child].connector[0]).addClass(area);
+            // Connectors are null until Treant has positioned the tree.
+            var connector = charts[area].tree.nodeDB.db[child].connector;
+            if(connector) $(connector[0]).addClass(area);
         }
 
     } else {
@@ -105,7 +120,7 @@ function updateResearch(area, name, active) {
         // For each Children update the connector
         for(const child of inode.children) {
             var child_node = charts[area].tree.nodeDB.db[child];
-            $(child_node.connector[0]).removeClass(area);
+            if(child_node.connector) $(child_node.connector[0]).removeClass(area);
             updateResearch(area, child_node.nodeHTMLid, false);
         }
 
@@ -127,6 +142,193 @@ function getInitNode(node, name) {
     return undefined;
 }
 
+// Research progress is a bitset over the stable tech indices in
+// tech-index.json (see scripts/build_tech_index.py), stored and shared as a
+// short URL-safe string: a tag byte, then either the raw bitset or
+// alternating zero/one run lengths as LEB128 varints, whichever is shorter.
+var techIndex = null;
+
+function load_tech_index() {
+    if(techIndex === null) {
+        techIndex = $.getJSON(assetUrl('tech-index.json')).then(function(jsonData) {
+            var byKey = {};
+            jsonData.keys.forEach(function(key, i) {
+                byKey[key] = i;
+            });
+            return { keys: jsonData.keys, byKey: byKey };
+        }, function() {
+            techIndex = null;
+            return $.Deferred().reject();
+        });
+    }
+    return techIndex;
+}
+
+function _pushVarint(out, value) {
+    while(value > 0x7f) {
+        out.push((value & 0x7f) | 0x80);
+        value >>>= 7;
+    }
+    out.push(value);
+}
+
+function encodeProgress(indices) {
+    var bits = Array.from(new Set(indices)).sort(function(a, b) { return a - b; });
+    var raw = new Array(bits.length ? (bits[bits.length - 1] >> 3) + 1 : 0).fill(0);
+    bits.forEach(function(i) {
+        raw[i >> 3] |= 1 << (i & 7);
+    });
+
+    var runs = [];
+    var position = 0;
+    for(var i = 0; i < bits.length; ) {
+        var j = i;
+        while(j + 1 < bits.length && bits[j + 1] === bits[j] + 1) j++;
+        _pushVarint(runs, bits[i] - position);
+        _pushVarint(runs, j - i + 1);
+        position = bits[j] + 1;
+        i = j + 1;
+    }
+
+    var data = runs.length < raw.length ? [1].concat(runs) : [0].concat(raw);
+    return btoa(String.fromCharCode.apply(null, data))
+        .replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+}
+
+// Returns the bit indices of an encoded state, or null if it is malformed.
+function decodeProgress(code) {
+    var data;
+    try {
+        data = atob(code.replace(/-/g, '+').replace(/_/g, '/') + '==='.slice((code.length + 3) % 4));
+    } catch(e) {
+        return null;
+    }
+    var bits = [];
+    if(data.length === 0) return null;
+    if(data.charCodeAt(0) === 0) {
+        for(var i = 1; i < data.length; i++) {
+            var byte = data.charCodeAt(i);
+            for(var bit = 0; bit < 8; bit++) {
+                if(byte & (1 << bit)) bits.push((i - 1) * 8 + bit);
+            }
+        }
+        return bits;
+    }
+    if(data.charCodeAt(0) !== 1) return null;
+
+    var values = [];
+    var value = 0;
+    var shift = 0;
+    for(var k = 1; k < data.length; k++) {
+        var b = data.charCodeAt(k);
+        value += (b & 0x7f) * Math.pow(2, shift);
+        shift += 7;
+        if(!(b & 0x80)) {
+            values.push(value);
+            value = 0;
+            shift = 0;
+        }
+    }
+    if(shift || values.length % 2) return null;
+    var position = 0;
+    for(var v = 0; v < values.length; v += 2) {
+        position += values[v];
+        for(var n = 0; n < values[v + 1]; n++) bits.push(position++);
+    }
+    return bits;
+}
+
+function _activeTechKeys() {
+    var keys = [];
+    research.forEach(area => {
+        $('.' + area + ' div.node-status.active').parent().not(':contains(\\(Starting\\))').each(function() {
+            keys.push($(this).attr('id'));
+        });
+    });
+    return keys;
+}
+
+function progressState(index) {
+    var indices = [];
+    _activeTechKeys().forEach(function(key) {
+        if(Object.prototype.hasOwnProperty.call(index.byKey, key)) {
+            indices.push(index.byKey[key]);
+        }
+    });
+    return encodeProgress(indices);
+}
+
+function _techArea(key) {
+    for(const tree in charts) {
+        if(_chartNode(charts[tree], key) !== null) return tree;
+    }
+    return null;
+}
+
+function restoreProgress(keys) {
+    research.forEach(area => {
+        $('.' + area + ' div.node-status.active').parent().not(':contains(\\(Starting\\))').each(function() {
+            if('anomaly' === area) {
+                $(this).removeClass('active').find('div.node-status').removeClass('active');
+            } else {
+                updateResearch(area, $(this).attr('id'), false);
+            }
+        });
+    });
+    keys.forEach(function(key) {
+        var node = document.getElementById(key);
+        if(node === null) return;
+        if($(node).hasClass('anomaly')) {
+            $(node).addClass('active').find('div.node-status').addClass('active');
+            return;
+        }
+        var area = _techArea(key);
+        if(area !== null) updateResearch(area, key, true);
+    });
+}
+
+function restoreProgressState(index, code) {
+    var bits = decodeProgress(code);
+    if(bits === null) return false;
+    restoreProgress(bits.filter(i => i < index.keys.length).map(i => index.keys[i]));
+    return true;
+}
+
+function restoreResearchFromHash() {
+    var m = /(?:^#|&)research=([A-Za-z0-9_-]+)/.exec(window.location.hash);
+    if(!m) return;
+    load_tech_index().done(function(index) {
+        if(!restoreProgressState(index, m[1])) {
+            console.log('Ignoring malformed research state in URL');
+        }
+    });
+}
+
+function shareResearch() {
+    load_tech_index().done(function(index) {
+        var url = window.location.href.split('#')[0] + '#research=' + progressState(index);
+        history.replaceState(null, '', url);
+        if(navigator.clipboard && navigator.clipboard.writeText) {
+            navigator.clipboard.writeText(url).then(function() {
+                alert('Research link copied to the clipboard.');
+            }, function() {
+                window.prompt('Research link:', url);
+            });
+        } else {
+            window.prompt('Research link:', url);
+        }
+    }).fail(function() {
+        alert('Unable to share research: tech-index.json could not be loaded.');
+    });
+}
+
+function setupShare() {
+    $('#research_share').off('click').on('click', function(event) {
+        event.preventDefault();
+        shareResearch();
+    }).parent().removeClass('hide');
+}
+
 // IndexedDB solution (Multiple research sets saved)
 var offlineDB;
 
@@ -194,6 +396,7 @@ function findLists() {
                     removeListFromIndexedDB( $('#research_selection').val() );
                 }
             })
+            setupShare();
             $('.research').removeClass('hide');
         }
     };
@@ -201,23 +404,19 @@ function findLists() {
 
 function saveListToIndexedDB(name) {
     if(offlineDB) {
-
-        var data = [];
-        research.forEach(area => {
-            $('.' + area + ' div.node-status.active').parent().not(':contains(\\(Starting\\))').each(function() {
-                data.push({key: $(this).attr('id'), area: area});
-            });
+        load_tech_index().done(function(index) {
+            var objectStore = offlineDB.transaction(["TreeStore"], "readwrite").objectStore("TreeStore");
+
+            var result = objectStore.put({name: name, state: progressState(index)});
+            result.onsuccess = function(event) {
+                if(event.target.result && name == event.target.result) {
+                    alert('Research List: ' + name + ' was saved successfully!')
+                    return true;
+                }
+            };
+        }).fail(function() {
+            alert('Unable to save Research List: ' + name + '\nError: tech-index.json could not be loaded.');
         });
-
-        var objectStore = offlineDB.transaction(["TreeStore"], "readwrite").objectStore("TreeStore");
-
-        var result = objectStore.put({name: name, data: data});
-        result.onsuccess = function(event) {
-            if(event.target.result && name == event.target.result) {
-                alert('Research List: ' + name + ' was saved successfully!')
-                return true;
-            }
-        };
     } else {
         initDB();
     }
@@ -229,24 +428,18 @@ function loadListFromIndexedDB(name) {
 
         var result = objectStore.get(name);
         result.onsuccess = function(event) {
-            if(event.target.result && event.target.result.data) {
-                var data = event.target.result.data;
-                research.forEach(area => {
-                    $('.' + area + ' div.node-status.active').parent().not(':contains(\\(Starting\\))').each(function() {
-                        updateResearch(area, $(this).attr('id'), false);
-                        $(this).find('div.node-status').removeClass('active');
-                    });
-                });
-                data.forEach(item => {
-                    if('anomaly' == item.area) {
-                        //TODO
-                        $('#' + item.key + ' .div.node-status').addClass('active');
-                    }
-                    else {
-                        updateResearch(item.area, item.key, true);
-                    }
+            var entry = event.target.result;
+            if(entry && entry.state) {
+                load_tech_index().done(function(index) {
+                    restoreProgressState(index, entry.state);
+                }).fail(function() {
+                    alert('Unable to load Research List: ' + name + '\nError: tech-index.json could not be loaded.');
                 });
             }
+            else if(entry && entry.data) {
+                // Lists saved before the bitset format.
+                restoreProgress(entry.data.map(item => item.key));
+            }
             else {
                 event.target.errorCode = `Research list "${name}" does not exist.`
                 result.onerror(event);
@@ -280,6 +473,7 @@ function removeListFromIndexedDB(name) {
 
 // LocalStorage solution (Single save)
 function setupLocalStorage() {
+    setupShare();
     $('#research_save').on('click', function(event) {
         event.preventDefault();
         saveResearchToLocalStorage();
@@ -291,25 +485,40 @@ function setupLocalStorage() {
 }
 
 function saveResearchToLocalStorage() {
-    var data = {};
+    load_tech_index().done(function(index) {
+        localStorage['LocalStorage'] = JSON.stringify({state: progressState(index)});
+    }).fail(function() {
+        alert("Unable to save research: tech-index.json could not be loaded.");
+    });
+}
+
+// As before the bitset format, trees are reloaded after a local load so
+// Treant redraws them with the restored state.
+function _reloadCharts() {
     research.forEach(area => {
-        var activeTech = [];
-        $('.' + area + ' div.node-status.active').parent().not(':contains(\\(Starting\\))').each(function() {
-            activeTech.push($(this).attr('id'));
-        });
-        data[area] = activeTech;
+        if(charts[area]) charts[area].tree.reload();
     });
-    localStorage['LocalStorage'] = JSON.stringify(data);
 }
 
 function loadResearchFromLocalStorage() {
     if(localStorage['LocalStorage']) {
         var data = JSON.parse(localStorage['LocalStorage']);
-        research.forEach(area => {
-            var activeTech = data[area];
-            activeTech.forEach(tech => updateResearch(area, tech, true));
-            charts[area].tree.reload();
-        });
+        if(data.state) {
+            load_tech_index().done(function(index) {
+                restoreProgressState(index, data.state);
+                _reloadCharts();
+            }).fail(function() {
+                alert("Unable to load research: tech-index.json could not be loaded.");
+            });
+        } else {
+            // Per-tree key lists saved before the bitset format.
+            var keys = [];
+            research.forEach(area => {
+                (data[area] || []).forEach(tech => keys.push(tech));
+            });
+            restoreProgress(keys);
+            _reloadCharts();
+        }
     } else {
         alert("Unable to load data from local storage!");
     }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from build_manifest import ASSET_REF_RE
+from versions import VERSION_AREA_FILE, find_versions, iter_techs
+
+_BUNDLE_NAME = "bundle.json"
+
+# Image directories that are shipped only as far as something references them;
+# everything else under assets/ (scripts, styles, vendor libraries) is copied whole.
+_IMAGE_DIRS = ("assets/img", "assets/icons", "jobs/assets")
+_PAGES = ("index.html", "jobs/index.html")
+
+_ICON_TOKEN_RE = re.compile(r"£(\w+)£")
+_IMAGE_PATH_RE = re.compile(r"(?:assets/(?:img|icons)|jobs/assets)/[\w\-./]+?\.png")
+_ROUTE_LINE_RE = re.compile(r"^[ \t]*\{[^\n]*\broute:\s*'([^']+)'[^\n]*\},[ \t]*\r?\n", re.MULTILINE)
+_DEFAULT_ROUTE_RE = re.compile(r"(const defaultRoute = ')([^']+)(')")
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _is_image(logical: str) -> bool:
+    return any(logical.startswith(d + "/") for d in _IMAGE_DIRS)
+
+
+class _References:
+    """Logical asset paths (relative to the repository root) and who uses them."""
+
+    def __init__(self, repo_root: Path) -> None:
+        self.repo_root = repo_root
+        self.by_path: dict[str, set[str]] = {}
+
+    def add(self, logical: str, referrer: str) -> None:
+        self.by_path.setdefault(logical, set()).add(referrer)
+
+    def add_text(self, text: str, referrer: str) -> None:
+        for m in _IMAGE_PATH_RE.finditer(text):
+            self.add(m.group(0), referrer)
+        for icon in _ICON_TOKEN_RE.findall(text):
+            self.add(f"assets/icons/{icon}.png", referrer)
+
+    def add_static(self, logical: str) -> None:
+        # Pages and stylesheets link relative to themselves, HTML fragments
+        # relative to the version page they are loaded into (see
+        # build_manifest._rewrite_dirs), and assetUrl()/~asset() take paths
+        # relative to the site root. Script literals are often URL pieces
+        # joined at runtime, so only the ones naming an existing file count.
+        text = (self.repo_root / logical).read_text(encoding="utf-8")
+        base_dir = "_page" if logical.startswith("assets/") and logical.endswith(".html") else posixpath.dirname(logical)
+        for m in ASSET_REF_RE.finditer(text):
+            ref = m.group(2)
+            if ref.startswith("/"):
+                continue
+            relative = posixpath.normpath(posixpath.join(base_dir, ref))
+            rooted = posixpath.normpath(ref)
+            if not (self.repo_root / relative).is_file() and (self.repo_root / rooted).is_file():
+                relative = rooted
+            if relative.startswith("../"):
+                continue
+            if logical.endswith(".js") and not (self.repo_root / relative).is_file():
+                continue
+            self.add(relative, logical)
+        self.add_text(text, logical)
+
+
+def collect_references(repo_root: Path, versions: list[str]) -> dict[str, set[str]]:
+    refs = _References(repo_root)
+    for page in _PAGES:
+        if (repo_root / page).is_file():
+            refs.add_static(page)
+    for p in sorted((repo_root / "assets").rglob("*")):
+        logical = p.relative_to(repo_root).as_posix()
+        if p.is_file() and p.suffix in (".css", ".js", ".html") and not _is_image(logical):
+            refs.add_static(logical)
+
+    for version in versions:
+        version_dir = repo_root / version
+        for tech in iter_techs(version_dir):
+            if tech.get("key"):
+                refs.add(f"assets/img/{tech['key']}.png", f"{version}/{tech.get('area', 'anomalies')}")
+            for prerequisite in tech.get("prerequisites") or []:
+                refs.add(f"assets/img/{prerequisite}.png", f"{version}/{tech.get('area', 'anomalies')}")
+        for p in sorted(version_dir.glob("*.json")):
+            refs.add_text(p.read_text(encoding="utf-8"), f"{version}/{p.name}")
+
+    jobs_json = repo_root / "jobs" / "jobs.json"
+    if jobs_json.is_file():
+        # Mirrors the node template in jobs/index.html.
+        patterns = {
+            "building": "jobs/assets/buildings/{}.png",
+            "icon": "assets/icons/job_{}.png",
+            "category": "assets/icons/pop_cat_{}.png",
+        }
+        for job in json.loads(jobs_json.read_text(encoding="utf-8")):
+            for field, pattern in patterns.items():
+                if job.get(field):
+                    refs.add(pattern.format(job[field]), "jobs/jobs.json")
+        refs.add_text(jobs_json.read_text(encoding="utf-8"), "jobs/jobs.json")
+    return refs.by_path
+
+
+def _prune_routes(text: str, versions: list[str]) -> str:
+    # The version menu only lists bundled versions, and the default route
+    # falls back to the first of them.
+    listed = [m.group(1) for m in _ROUTE_LINE_RE.finditer(text)]
+    kept = [route for route in listed if route in versions]
+    if not kept:
+        return text
+    text = _ROUTE_LINE_RE.sub(lambda m: m.group(0) if m.group(1) in versions else "", text)
+    return _DEFAULT_ROUTE_RE.sub(
+        lambda m: m.group(0) if m.group(2) in kept else m.group(1) + kept[0] + m.group(3), text
+    )
+
+
+def _place(src: Path, dst: Path, link: str) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if link == "symlink":
+        dst.symlink_to(src)
+        return
+    if link == "hardlink":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def build_bundle(repo_root: Path, versions: list[str], out_dir: Path, link: str = "copy") -> dict:
+    refs = collect_references(repo_root, versions)
+
+    files: set[str] = {"favicon.ico", "tech-index.json"}
+    for p in (repo_root / "assets").rglob("*"):
+        logical = p.relative_to(repo_root).as_posix()
+        if p.is_file() and not _is_image(logical):
+            files.add(logical)
+    for version in versions:
+        files.add(f"{version}/index.html")
+        files.update(p.relative_to(repo_root).as_posix() for p in (repo_root / version).glob("*.json"))
+    if (repo_root / "jobs" / "jobs.json").is_file():
+        files.add("jobs/jobs.json")
+    files.update(logical for logical in refs if _is_image(logical))
+
+    shipped = sorted(f for f in files if (repo_root / f).is_file())
+    for logical in shipped:
+        _place(repo_root / logical, out_dir / logical, link)
+    for page in _PAGES:
+        src = repo_root / page
+        if not src.is_file():
+            continue
+        with src.open(encoding="utf-8", newline="") as f:
+            text = f.read()
+        if page == "index.html":
+            text = _prune_routes(text, versions)
+        dst = out_dir / page
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with dst.open("w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        shipped.append(page)
+
+    images = sorted(
+        p.relative_to(repo_root).as_posix()
+        for d in _IMAGE_DIRS
+        for p in (repo_root / d).rglob("*")
+        if p.is_file()
+    )
+    report = {
+        "versions": versions,
+        "files": sorted(shipped),
+        "missing": {
+            logical: sorted(referrers)
+            for logical, referrers in sorted(refs.items())
+            if not (repo_root / logical).is_file()
+        },
+        "unused": [logical for logical in images if logical not in refs],
+        "images": len(images),
+        "image_bytes": sum((repo_root / logical).stat().st_size for logical in images),
+        "shipped_image_bytes": sum(
+            (repo_root / logical).stat().st_size for logical in shipped if _is_image(logical)
+        ),
+    }
+    (out_dir / _BUNDLE_NAME).write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Write a deploy directory with the pages, scripts and only the images the selected versions use."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=None,
+        help="Version directory name(s) to include (default: every version directory).",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=Path("deploy"),
+        help="Output directory, relative to the repository root (default: deploy).",
+    )
+    parser.add_argument(
+        "--link",
+        choices=("copy", "hardlink", "symlink"),
+        default="copy",
+        help="How files are placed in the output directory (default: copy; hardlink falls back to copy).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    out_dir = (repo_root / args.out_dir).resolve()
+    if out_dir == repo_root or out_dir in repo_root.parents:
+        _eprint(f"ERROR: output directory must not contain the repository: {out_dir}")
+        return 2
+    if out_dir.exists():
+        if any(out_dir.iterdir()) and not (out_dir / _BUNDLE_NAME).exists():
+            _eprint(f"ERROR: refusing to overwrite non-empty directory without {_BUNDLE_NAME}: {out_dir}")
+            return 2
+        shutil.rmtree(out_dir)
+
+    versions = args.version or find_versions(repo_root)
+    for version in versions:
+        if not (repo_root / version / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {repo_root / version}")
+            return 2
+
+    report = build_bundle(repo_root, versions, out_dir, args.link)
+    shipped_images = sum(1 for logical in report["files"] if _is_image(logical))
+    print(f"Written: {out_dir / _BUNDLE_NAME}")
+    print(f"Versions: {len(versions)}")
+    print(f"Files: {len(report['files'])}")
+    print(
+        f"Images: {shipped_images} / {report['images']} "
+        f"({report['shipped_image_bytes'] / 1e6:.1f} MB of {report['image_bytes'] / 1e6:.1f} MB)"
+    )
+    print(f"Unused images: {len(report['unused'])}")
+    print(f"Missing assets: {len(report['missing'])}")
+    for logical, referrers in report["missing"].items():
+        more = f" (+{len(referrers) - 1})" if len(referrers) > 1 else ""
+        print(f"  {logical} <- {referrers[0]}{more}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
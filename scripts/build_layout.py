@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from versions import AREAS, VERSION_AREA_FILE, find_versions
+
+_LAYOUT_NAME = "layout.json"
+
+# Mirrors `config` in assets/js/tech-tree.js plus the Treant defaults it
+# does not override (levelSeparation, padding, maxDepth).
+_ROOT_ORIENTATION = "WEST"
+_NODE_ALIGN = "TOP"
+_SIBLING_SEPARATION = 20
+_SUBTREE_SEPARATION = 20
+_LEVEL_SEPARATION = 30
+_PADDING = 15
+_MAX_DEPTH = 100
+
+# offsetWidth/offsetHeight of a `.tech` node in assets/css/tech-tree.css:
+# 275x66 content box + 2px padding + 3px border on each side.
+_NODE_WIDTH = 285
+_NODE_HEIGHT = 76
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _js_number(value: float) -> str:
+    # Number formatting as in JavaScript's String(number), which Treant uses
+    # to build connector paths.
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Node:
+    __slots__ = (
+        "id", "key", "parent", "children", "width", "height",
+        "prelim", "modifier", "left_neighbor", "right_neighbor", "x", "y",
+    )
+
+    def __init__(self, node_id: int, key: str | None, parent: _Node | None, width: int, height: int) -> None:
+        self.id = node_id
+        self.key = key
+        self.parent = parent
+        self.children: list[_Node] = []
+        self.width = width
+        self.height = height
+        self.prelim = 0.0
+        self.modifier = 0.0
+        self.left_neighbor: _Node | None = None
+        self.right_neighbor: _Node | None = None
+        self.x = 0.0
+        self.y = 0.0
+
+    def size(self) -> float:
+        # WEST/EAST trees grow downwards, so sibling spacing uses the height.
+        return self.height
+
+    def left_sibling(self) -> _Node | None:
+        n = self.left_neighbor
+        return n if n is not None and n.parent is self.parent else None
+
+    def right_sibling(self) -> _Node | None:
+        n = self.right_neighbor
+        return n if n is not None and n.parent is self.parent else None
+
+    def children_center(self) -> float:
+        first, last = self.children[0], self.children[-1]
+        return first.prelim + ((last.prelim - first.prelim) + last.size()) / 2
+
+    def left_most(self, level: int, depth: int) -> _Node | None:
+        if level >= depth:
+            return self
+        for child in self.children:
+            found = child.left_most(level + 1, depth)
+            if found is not None:
+                return found
+        return None
+
+
+class TreeLayout:
+    """Port of Treant's positionTree for the tech tree configuration.
+
+    Nodes are numbered in the same pre-order as Treant's NodeDB, so the page
+    can pair them with its own walk of the area JSON.
+    """
+
+    def __init__(self, root_structure: dict) -> None:
+        self.nodes: list[_Node] = []
+        self._last_on_level: dict[int, _Node] = {}
+        self._level_dims: dict[int, tuple[float, float]] = {}
+        self.root = self._add(root_structure, None)
+
+    def _add(self, structure: dict, parent: _Node | None) -> _Node:
+        hidden_root = parent is None
+        node = _Node(
+            len(self.nodes),
+            structure.get("key"),
+            parent,
+            0 if hidden_root else _NODE_WIDTH,
+            0 if hidden_root else _NODE_HEIGHT,
+        )
+        self.nodes.append(node)
+        if parent is not None:
+            parent.children.append(node)
+        for child in structure.get("children") or []:
+            self._add(child, node)
+        return node
+
+    def _first_walk(self, node: _Node, level: int) -> None:
+        node.prelim = 0.0
+        node.modifier = 0.0
+        node.left_neighbor = self._last_on_level.get(level)
+        if node.left_neighbor is not None:
+            node.left_neighbor.right_neighbor = node
+        self._last_on_level[level] = node
+        width, height = self._level_dims.get(level, (0, 0))
+        self._level_dims[level] = (max(width, node.width), max(height, node.height))
+
+        left_sibling = node.left_sibling()
+        if not node.children or level == _MAX_DEPTH:
+            if left_sibling is not None:
+                node.prelim = left_sibling.prelim + left_sibling.size() + _SIBLING_SEPARATION
+            return
+
+        for child in node.children:
+            self._first_walk(child, level + 1)
+        mid_point = node.children_center() - node.size() / 2
+        if left_sibling is not None:
+            node.prelim = left_sibling.prelim + left_sibling.size() + _SIBLING_SEPARATION
+            node.modifier = node.prelim - mid_point
+            self._apportion(node, level)
+        else:
+            node.prelim = mid_point
+
+    def _apportion(self, node: _Node, level: int) -> None:
+        first_child: _Node | None = node.children[0]
+        left_neighbor = first_child.left_neighbor
+        compare_depth = 1
+        depth_to_stop = _MAX_DEPTH - level
+
+        while first_child is not None and left_neighbor is not None and compare_depth <= depth_to_stop:
+            modifier_sum_right = 0.0
+            modifier_sum_left = 0.0
+            left_ancestor = left_neighbor
+            right_ancestor = first_child
+            for _ in range(compare_depth):
+                left_ancestor = left_ancestor.parent
+                right_ancestor = right_ancestor.parent
+                modifier_sum_left += left_ancestor.modifier
+                modifier_sum_right += right_ancestor.modifier
+
+            total_gap = (
+                left_neighbor.prelim + modifier_sum_left + left_neighbor.size() + _SUBTREE_SEPARATION
+            ) - (first_child.prelim + modifier_sum_right)
+
+            if total_gap > 0:
+                subtree_aux: _Node | None = node
+                num_subtrees = 0
+                while subtree_aux is not None and subtree_aux is not left_ancestor:
+                    subtree_aux = subtree_aux.left_sibling()
+                    num_subtrees += 1
+                if subtree_aux is not None:
+                    subtree_move = node
+                    single_gap = total_gap / num_subtrees
+                    while subtree_move is not left_ancestor:
+                        subtree_move.prelim += total_gap
+                        subtree_move.modifier += total_gap
+                        total_gap -= single_gap
+                        subtree_move = subtree_move.left_sibling()
+
+            compare_depth += 1
+            first_child = node.left_most(0, compare_depth) if not first_child.children else first_child.children[0]
+            if first_child is not None:
+                left_neighbor = first_child.left_neighbor
+
+    def _second_walk(self, node: _Node | None, level: int, x: float, y: float) -> None:
+        # Treant recurses into the right sibling last; walking siblings in a
+        # loop keeps wide levels clear of Python's recursion limit.
+        while node is not None and level <= _MAX_DEPTH:
+            level_height = self._level_dims[level][0]
+            along = node.prelim + x
+            across = y + (level_height - node.width) if _NODE_ALIGN == "TOP" else y
+            node.x, node.y = across, along
+
+            if node.children:
+                if node is self.root:
+                    self._second_walk(node.children[0], level + 1, x + node.modifier, y)
+                else:
+                    self._second_walk(
+                        node.children[0], level + 1, x + node.modifier, y + level_height + _LEVEL_SEPARATION
+                    )
+            node = node.right_sibling()
+
+    def run(self) -> dict:
+        self._first_walk(self.root, 0)
+        self._second_walk(self.root, 0, 0.0, 0.0)
+
+        min_x = min(n.x for n in self.nodes)
+        max_x = max(n.x + n.width for n in self.nodes)
+        min_y = min(n.y for n in self.nodes)
+        max_y = max(n.y + n.height for n in self.nodes)
+
+        for node in self.nodes[1:]:
+            node.x += _PADDING
+            node.y += _PADDING
+
+        placed = [None]
+        for node in self.nodes[1:]:
+            path = None
+            parent = node.parent
+            if parent is not self.root:
+                sx, sy = parent.x + parent.width, parent.y + parent.height / 2
+                ex, ey = node.x, node.y + node.height / 2
+                mx = (sx + ex) / 2
+                path = " ".join([
+                    "M", f"{_js_number(sx)},{_js_number(sy)}",
+                    "L", f"{_js_number(mx)},{_js_number(sy)}",
+                    "L", f"{_js_number(mx)},{_js_number(ey)}",
+                    "L", f"{_js_number(ex)},{_js_number(ey)}",
+                ])
+            placed.append([node.key, node.x, node.y, path])
+
+        return {
+            "width": max_x - min_x,
+            "height": max_y - min_y,
+            "nodes": placed,
+        }
+
+
+def build_layout(version_dir: Path) -> dict:
+    areas = {}
+    for area in AREAS:
+        data = json.loads((version_dir / f"{area}.json").read_text(encoding="utf-8"))
+        areas[area] = TreeLayout(data["children"][0]).run()
+    return {
+        "orientation": _ROOT_ORIENTATION,
+        "node": {"width": _NODE_WIDTH, "height": _NODE_HEIGHT},
+        "padding": _PADDING,
+        "areas": areas,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute Treant tree positions and connector paths into <version>/layout.json."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=None,
+        help="Version directory name(s) (default: every version directory).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    versions = args.version or find_versions(repo_root)
+    for version in versions:
+        version_dir = repo_root / version
+        if not (version_dir / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {version_dir}")
+            return 2
+
+    for version in versions:
+        out_path = repo_root / version / _LAYOUT_NAME
+        layout = build_layout(repo_root / version)
+        text = json.dumps(layout, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if not out_path.exists() or out_path.read_text(encoding="utf-8") != text:
+            out_path.write_text(text, encoding="utf-8")
+        counts = ", ".join(f"{a} {len(layout['areas'][a]['nodes']) - 1}" for a in AREAS)
+        print(f"Written: {out_path} ({counts})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from versions import VERSION_AREA_FILE, find_versions
+
+_MANIFEST_NAME = "asset-manifest.json"
+_STATIC_DIR = "static"
+_HASH_LEN = 12
+
+ASSET_REF_RE = re.compile(
+    r"""(["'(])((?:\.{1,2}/)*[A-Za-z0-9_\-./]+\.(?:png|jpe?g|gif|svg|ico|css|js|json|html|ttf|woff2?))(?=["')?#])"""
+)
+
+_HEADERS = """/static/*
+  Cache-Control: public, max-age=31536000, immutable
+/asset-manifest.json
+  Cache-Control: no-cache
+/index.html
+  Cache-Control: no-cache
+/*/index.html
+  Cache-Control: no-cache
+"""
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _collect_assets(repo_root: Path, versions: list[str]) -> list[str]:
+    files: set[str] = {"favicon.ico", "tech-index.json"}
+    for p in (repo_root / "assets").rglob("*"):
+        if p.is_file():
+            files.add(p.relative_to(repo_root).as_posix())
+    for version in versions:
+        for p in (repo_root / version).glob("*.json"):
+            files.add(p.relative_to(repo_root).as_posix())
+    jobs = repo_root / "jobs"
+    if jobs.is_dir():
+        files.add("jobs/jobs.json")
+        for p in (jobs / "assets").rglob("*"):
+            if p.is_file():
+                files.add(p.relative_to(repo_root).as_posix())
+    return sorted(f for f in files if (repo_root / f).is_file())
+
+
+def _hashed_name(logical: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:_HASH_LEN]
+    stem, dot, suffix = logical.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{_STATIC_DIR}/{logical}.{digest}"
+    return f"{_STATIC_DIR}/{stem}.{digest}.{suffix}"
+
+
+def _rewrite_refs(text: str, base_dir: str, manifest: dict[str, str], out_dir: str | None = None) -> str:
+    # base_dir resolves the references as written; out_dir is where the
+    # rewritten file will live (for stylesheets, their hashed location).
+    rel_dir = (base_dir if out_dir is None else out_dir) or "."
+
+    def repl(m: re.Match[str]) -> str:
+        logical = posixpath.normpath(posixpath.join(base_dir, m.group(2)))
+        target = manifest.get(logical)
+        if target is None:
+            return m.group(0)
+        return m.group(1) + posixpath.relpath(target, rel_dir)
+
+    return ASSET_REF_RE.sub(repl, text)
+
+
+def _rewrite_dirs(logical: str) -> tuple[str, str]:
+    # HTML fragments are injected into a version page (<root>/<version>/), so
+    # their relative links resolve one level below the site root; CSS links
+    # resolve against the stylesheet itself, before and after hashing.
+    if logical.endswith(".html"):
+        return "_page", "_page"
+    return posixpath.dirname(logical), posixpath.dirname(_hashed_name(logical, b""))
+
+
+def build_manifest(repo_root: Path, versions: list[str], out_dir: Path) -> dict[str, str]:
+    logicals = _collect_assets(repo_root, versions)
+    manifest: dict[str, str] = {}
+    contents: dict[str, bytes] = {}
+
+    # Plain files first, then stylesheets and HTML fragments, whose content
+    # (and therefore hash) depends on the hashed names they reference.
+    rewritten = [f for f in logicals if f.endswith((".css", ".html"))]
+    for logical in logicals:
+        if logical in rewritten:
+            continue
+        data = (repo_root / logical).read_bytes()
+        manifest[logical] = _hashed_name(logical, data)
+        contents[manifest[logical]] = data
+    for logical in sorted(rewritten, key=lambda f: (not f.endswith(".css"), f)):
+        text = (repo_root / logical).read_text(encoding="utf-8")
+        base_dir, hashed_dir = _rewrite_dirs(logical)
+        data = _rewrite_refs(text, base_dir, manifest, hashed_dir).encode("utf-8")
+        manifest[logical] = _hashed_name(logical, data)
+        contents[manifest[logical]] = data
+
+    for target, data in contents.items():
+        path = out_dir / target
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    pages = ["index.html", "jobs/index.html"] + [f"{v}/index.html" for v in versions]
+    for page in pages:
+        src = repo_root / page
+        if not src.exists():
+            continue
+        text = _rewrite_refs(src.read_text(encoding="utf-8"), posixpath.dirname(page), manifest)
+        dst = out_dir / page
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_text(text, encoding="utf-8")
+
+    (out_dir / _MANIFEST_NAME).write_text(
+        json.dumps({"assets": manifest}, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    (out_dir / "_headers").write_text(_HEADERS, encoding="utf-8")
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Write a content-hashed copy of the site plus asset-manifest.json for long-lived HTTP caching."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=None,
+        help="Version directory name(s) to include (default: every version directory).",
+    )
+    parser.add_argument(
+        "--source-dir",
+        type=Path,
+        default=None,
+        help="Site to hash, relative to the repository root, e.g. the deploy directory "
+        "written by build_bundle.py (default: the repository itself).",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=Path("dist"),
+        help="Output directory, relative to the repository root (default: dist).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    site_root = (repo_root / args.source_dir).resolve() if args.source_dir else repo_root
+    if not (site_root / "index.html").is_file():
+        _eprint(f"ERROR: no index.html in source directory: {site_root}")
+        return 2
+    out_dir = (repo_root / args.out_dir).resolve()
+    if out_dir == site_root or out_dir in site_root.parents:
+        _eprint(f"ERROR: output directory must not contain the source directory: {out_dir}")
+        return 2
+    if out_dir.exists():
+        if any(out_dir.iterdir()) and not (out_dir / _MANIFEST_NAME).exists():
+            _eprint(f"ERROR: refusing to overwrite non-empty directory without {_MANIFEST_NAME}: {out_dir}")
+            return 2
+        shutil.rmtree(out_dir)
+
+    versions = args.version or find_versions(site_root)
+    for version in versions:
+        if not (site_root / version / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {site_root / version}")
+            return 2
+
+    manifest = build_manifest(site_root, versions, out_dir)
+    print(f"Written: {out_dir / _MANIFEST_NAME}")
+    print(f"Versions: {len(versions)}")
+    print(f"Hashed assets: {len(manifest)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,27 @@
 from __future__ import annotations
 
 import argparse
-import datetime as _dt
+import hashlib
+import heapq
 import json
+import multiprocessing
+import os
 import re
 import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
 
+from condition_tree import UNLOCK_RE, parse_condition
+from loc_table import LocTable, ReverseIndex
+from translation_memory import TranslationMemory
+from versions import LINE_FIELDS, i18n_file_name
+
+# Modules whose code decides how a line is translated: their source is part of
+# the translation-memory key (_rules_digest), and --watch reloads them on change,
+# in this order (dependencies first).
+RULES_MODULES = ("loc_table", "condition_tree", "build_phoenix_i18n")
+
 
 def _eprint(*args: object) -> None:
     print(*args, file=sys.stderr)
@@ -17,6 +32,13 @@ def _read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8-sig", errors="replace")
 
 
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
 _VDF_PATH_RE = re.compile(r'"path"\s*"([^"]+)"')
 _LOC_LINE_RE = re.compile(
     r'^\s*([A-Za-z0-9_.\-]+)\s*:\s*(?:\d+\s*)?"((?:[^"\\]|\\.)*)"\s*(?:#.*)?$'
@@ -24,41 +46,68 @@ _LOC_LINE_RE = re.compile(
 _REF_RE = re.compile(r"\$([A-Za-z0-9_.\-]+)(?:\|[^$]+)?\$")
 
 
-def _try_find_steam_root() -> Path | None:
+_LOC_DIR_NAMES = ("localisation", "localization")
+_LOC_SCAN_DEPTH = 3
+_DISCOVERY_CACHE_NAME = "discovery.json"
+_MEMORY_NAME = "translation-memory.sqlite3"
+
+
+def _steam_root_candidates() -> list[Path]:
+    home = Path.home()
+    if sys.platform == "darwin":
+        return [home / "Library" / "Application Support" / "Steam"]
+    return [
+        home / ".steam" / "steam",
+        home / ".steam" / "root",
+        home / ".local" / "share" / "Steam",
+        home / ".var" / "app" / "com.valvesoftware.Steam" / ".local" / "share" / "Steam",
+        home / "snap" / "steam" / "common" / ".local" / "share" / "Steam",
+    ]
+
+
+def _try_find_steam_roots() -> list[Path]:
+    roots: list[Path] = []
     try:
         import winreg  # type: ignore
     except Exception:
-        return None
+        winreg = None
+
+    if winreg is not None:
+        keys = [
+            (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath"),
+            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
+            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam", "InstallPath"),
+        ]
+        for hive, subkey, value_name in keys:
+            try:
+                with winreg.OpenKey(hive, subkey) as key:
+                    value, _ = winreg.QueryValueEx(key, value_name)
+                    if value and isinstance(value, str):
+                        p = Path(value)
+                        if p.exists():
+                            roots.append(p)
+            except Exception:
+                continue
 
-    keys = [
-        (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath"),
-        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
-        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam", "InstallPath"),
-    ]
-    for hive, subkey, value_name in keys:
-        try:
-            with winreg.OpenKey(hive, subkey) as key:
-                value, _ = winreg.QueryValueEx(key, value_name)
-                if value and isinstance(value, str):
-                    p = Path(value)
-                    if p.exists():
-                        return p
-        except Exception:
-            continue
-    return None
+    for p in _steam_root_candidates():
+        if (p / "steamapps").is_dir():
+            roots.append(p)
+    return roots
 
 
 def _iter_steam_library_roots(steam_root: Path) -> list[Path]:
     roots = [steam_root]
-    vdf = steam_root / "steamapps" / "libraryfolders.vdf"
-    if not vdf.exists():
-        return roots
-
-    txt = _read_text(vdf)
-    for m in _VDF_PATH_RE.finditer(txt):
-        p = Path(m.group(1).replace("\\\\", "\\"))
-        if p.exists():
-            roots.append(p)
+    for vdf in (
+        steam_root / "steamapps" / "libraryfolders.vdf",
+        steam_root / "config" / "libraryfolders.vdf",
+    ):
+        if not vdf.exists():
+            continue
+        txt = _read_text(vdf)
+        for m in _VDF_PATH_RE.finditer(txt):
+            p = Path(m.group(1).replace("\\\\", "\\"))
+            if p.exists():
+                roots.append(p)
 
     seen: set[Path] = set()
     uniq: list[Path] = []
@@ -71,32 +120,113 @@ def _iter_steam_library_roots(steam_root: Path) -> list[Path]:
 
 
 def _try_find_stellaris_dir() -> Path | None:
-    steam_root = _try_find_steam_root()
-    if not steam_root:
-        return None
-
-    for lib in _iter_steam_library_roots(steam_root):
-        candidate = lib / "steamapps" / "common" / "Stellaris"
-        if candidate.exists():
-            return candidate
+    for steam_root in _try_find_steam_roots():
+        for lib in _iter_steam_library_roots(steam_root):
+            candidate = lib / "steamapps" / "common" / "Stellaris"
+            if candidate.exists():
+                return candidate
     return None
 
 
 def _find_localisation_root(stellaris_dir: Path) -> Path | None:
-    for name in ("localisation", "localization"):
+    for name in _LOC_DIR_NAMES:
         p = stellaris_dir / name
         if p.exists():
             return p
-    for p in stellaris_dir.glob("**/localisation"):
-        if p.is_dir():
-            return p
-    for p in stellaris_dir.glob("**/localization"):
-        if p.is_dir():
-            return p
+
+    # Breadth-first and depth-limited: the game install is several GB and the
+    # localisation folder never sits deep below it.
+    frontier = [stellaris_dir]
+    for _ in range(_LOC_SCAN_DEPTH):
+        next_level: list[Path] = []
+        for d in frontier:
+            try:
+                children = sorted(p for p in d.iterdir() if p.is_dir())
+            except OSError:
+                continue
+            for name in _LOC_DIR_NAMES:
+                for child in children:
+                    if child.name == name:
+                        return child
+            next_level.extend(children)
+        frontier = next_level
     return None
 
 
-def _make_resolver(loc: dict[str, str]):
+def _user_config_dir() -> Path:
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA")
+        return (Path(base) if base else Path.home() / "AppData" / "Roaming") / "stellaris-tech-tree"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "stellaris-tech-tree"
+    base = os.environ.get("XDG_CONFIG_HOME")
+    return (Path(base) if base else Path.home() / ".config") / "stellaris-tech-tree"
+
+
+def default_memory_path() -> Path:
+    return _user_config_dir() / _MEMORY_NAME
+
+
+def _load_discovery_cache() -> dict:
+    try:
+        cache = json.loads(_read_text(_user_config_dir() / _DISCOVERY_CACHE_NAME))
+    except (OSError, ValueError):
+        return {"auto": None, "installs": {}}
+    if not isinstance(cache, dict) or not isinstance(cache.get("installs"), dict):
+        return {"auto": None, "installs": {}}
+    return cache
+
+
+def _save_discovery_cache(cache: dict) -> None:
+    path = _user_config_dir() / _DISCOVERY_CACHE_NAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _discover_localisation_root(stellaris_dir: Path | None) -> tuple[Path | None, Path | None]:
+    """Resolve the install and localisation directories, remembering both.
+
+    Results are cached in the user config directory; a cached localisation
+    path is trusted while the install directory's mtime is unchanged.
+    """
+    cache = _load_discovery_cache()
+    dirty = False
+
+    if stellaris_dir is None:
+        auto = cache.get("auto")
+        if isinstance(auto, str) and Path(auto).is_dir():
+            stellaris_dir = Path(auto)
+        else:
+            stellaris_dir = _try_find_stellaris_dir()
+            if stellaris_dir is None:
+                return None, None
+            cache["auto"] = str(stellaris_dir.resolve())
+            dirty = True
+    stellaris_dir = stellaris_dir.resolve()
+
+    key = str(stellaris_dir)
+    mtime = _mtime_ns(stellaris_dir)
+    entry = cache["installs"].get(key)
+    loc_root = None
+    if isinstance(entry, dict) and entry.get("mtime") == mtime and isinstance(entry.get("localisation"), str):
+        cached_root = Path(entry["localisation"])
+        if cached_root.is_dir():
+            loc_root = cached_root
+    if loc_root is None:
+        loc_root = _find_localisation_root(stellaris_dir)
+        if loc_root is not None:
+            cache["installs"][key] = {"mtime": mtime, "localisation": str(loc_root)}
+            dirty = True
+
+    if dirty:
+        _save_discovery_cache(cache)
+    return stellaris_dir, loc_root
+
+
+def _make_resolver(loc: Mapping[str, str]):
     resolved: dict[str, str] = {}
     resolving: set[str] = set()
 
@@ -123,6 +253,8 @@ def _make_resolver(loc: dict[str, str]):
         value = loc.get(key)
         if value is None:
             return None
+        if "$" not in value:
+            return value
         resolving.add(key)
         out = resolve_text(value)
         resolving.remove(key)
@@ -132,26 +264,28 @@ def _make_resolver(loc: dict[str, str]):
     return resolve_key, resolve_text
 
 
-def _parse_localisation_dir(lang_dir: Path) -> dict[str, str]:
+def _parse_localisation_file(yml: Path) -> dict[str, str]:
     out: dict[str, str] = {}
-    if not lang_dir.exists():
-        return out
-
-    for yml in sorted(lang_dir.rglob("*.yml")):
-        txt = _read_text(yml)
-        for line in txt.splitlines():
-            m = _LOC_LINE_RE.match(line)
-            if not m:
-                continue
-            key = m.group(1)
-            raw = m.group(2)
-            raw = raw.replace(r"\\", "\\")
-            raw = raw.replace(r"\"", '"')
-            raw = raw.replace(r"\n", "\n")
-            out[key] = raw
+    txt = _read_text(yml)
+    for line in txt.splitlines():
+        m = _LOC_LINE_RE.match(line)
+        if not m:
+            continue
+        key = m.group(1)
+        raw = m.group(2)
+        raw = raw.replace(r"\\", "\\")
+        raw = raw.replace(r"\"", '"')
+        raw = raw.replace(r"\n", "\n")
+        out[key] = raw
     return out
 
 
+def _iter_localisation_files(lang_dir: Path) -> list[Path]:
+    if not lang_dir.exists():
+        return []
+    return sorted(lang_dir.rglob("*.yml"))
+
+
 def _load_json(path: Path):
     return json.loads(_read_text(path))
 
@@ -195,7 +329,7 @@ def _desc_keys(key: str) -> list[str]:
     ]
 
 
-def _build_reverse_value_map(source: dict[str, str]) -> dict[str, str]:
+def _build_reverse_value_map(source: Mapping[str, str]) -> dict[str, str]:
     out: dict[str, str] = {}
     for key, value in source.items():
         if value not in out:
@@ -229,15 +363,16 @@ def _safe_phrase(en_text: str, zh_text: str) -> bool:
 def _apply_official_phrases(
     line: str,
     phrase_pairs: list[tuple[str, str]],
-    type_map: dict[str, str],
+    type_map: dict[str, str] | None,
 ) -> str:
     out = line
 
-    out = re.sub(
-        r"<b>([^<]+)</b>\s*:",
-        lambda m: f"<b>{type_map.get(m.group(1).strip(), m.group(1).strip())}</b>：",
-        out,
-    )
+    if type_map is not None:
+        out = re.sub(
+            r"<b>([^<]+)</b>\s*:",
+            lambda m: f"<b>{type_map.get(m.group(1).strip(), m.group(1).strip())}</b>：",
+            out,
+        )
 
     for src, dst in phrase_pairs:
         if src in out:
@@ -499,6 +634,27 @@ def _normalize_mixed_line(line: str) -> str:
         ("Large UV Beam Projector", "大型紫外光束投射器"),
         ("Medium UV Beam Projector", "中型紫外光束投射器"),
         ("Small UV Beam Projector", "小型紫外光束投射器"),
+        ("Large Red Beam Projector", "大型红色光束投射器"),
+        ("Medium Red Beam Projector", "中型红色光束投射器"),
+        ("Small Red Beam Projector", "小型红色光束投射器"),
+        ("Large Blue Beam Projector", "大型蓝色光束投射器"),
+        ("Medium Blue Beam Projector", "中型蓝色光束投射器"),
+        ("Small Blue Beam Projector", "小型蓝色光束投射器"),
+        ("Large Gamma Beam Projector", "大型伽马光束投射器"),
+        ("Medium Gamma Beam Projector", "中型伽马光束投射器"),
+        ("Small Gamma Beam Projector", "小型伽马光束投射器"),
+        ("Large X-Ray Beam Projector", "大型X射线光束投射器"),
+        ("Medium X-Ray Beam Projector", "中型X射线光束投射器"),
+        ("Small X-Ray Beam Projector", "小型X射线光束投射器"),
+        ("Large Bio-Plasma Accelerator", "大型生物等离子加速炮"),
+        ("Medium Bio-Plasma Accelerator", "中型生物等离子加速炮"),
+        ("Small Bio-Plasma Accelerator", "小型生物等离子加速炮"),
+        ("Large Bio-Plasma Cannon", "大型生物等离子加农炮"),
+        ("Medium Bio-Plasma Cannon", "中型生物等离子加农炮"),
+        ("Small Bio-Plasma Cannon", "小型生物等离子加农炮"),
+        ("Large Bio-Plasma Thrower", "大型生物等离子喷射炮"),
+        ("Medium Bio-Plasma Thrower", "中型生物等离子喷射炮"),
+        ("Small Bio-Plasma Thrower", "小型生物等离子喷射炮"),
         ("Starbase", "恒星基地"),
         ("Module", "模块"),
         ("Upgrade", "升级"),
@@ -594,65 +750,151 @@ def _normalize_mixed_line(line: str) -> str:
     return out
 
 
-def main(argv: list[str]) -> int:
-    parser = argparse.ArgumentParser(
-        description="Generate version i18n.zh-hans.json from official Stellaris localisation."
-    )
-    parser.add_argument(
-        "--stellaris-dir",
-        type=Path,
-        default=None,
-        help="Path to Stellaris install directory (default: auto-detect Steam install).",
-    )
-    parser.add_argument(
-        "--phoenix-dir",
-        type=Path,
-        default=Path("phoenix-4.0.10"),
-        help="Version data directory (default: phoenix-4.0.10).",
-    )
-    parser.add_argument(
-        "--out",
-        type=Path,
-        default=Path("phoenix-4.0.10") / "i18n.zh-hans.json",
-        help="Output file (default: phoenix-4.0.10/i18n.zh-hans.json).",
-    )
-    args = parser.parse_args(argv)
-
-    repo_root = Path(__file__).resolve().parents[1]
-    version_dir = (repo_root / args.phoenix_dir).resolve()
-    out_path = (repo_root / args.out).resolve()
-
-    stellaris_dir = args.stellaris_dir or _try_find_stellaris_dir()
-    if stellaris_dir is None:
-        _eprint("ERROR: 无法自动定位 Stellaris 安装目录。")
-        _eprint("请传入 --stellaris-dir，例如：")
-        _eprint(r'  python scripts/build_phoenix_i18n.py --stellaris-dir "D:\SteamLibrary\steamapps\common\Stellaris"')
-        return 2
-    stellaris_dir = stellaris_dir.resolve()
-
-    loc_root = _find_localisation_root(stellaris_dir)
-    if not loc_root:
-        _eprint(f"ERROR: 在 {stellaris_dir} 下找不到 localisation/localization 目录。")
-        return 2
-
-    en_dir = loc_root / "english"
-    zh_dir = loc_root / "simp_chinese"
-    if not en_dir.exists() or not zh_dir.exists():
-        _eprint(f"ERROR: 找不到语言目录：{en_dir} 或 {zh_dir}")
-        return 2
+_TYPE_MAP = {
+    "Building": "建筑",
+    "Component": "组件",
+    "Edict": "法令",
+    "Feature": "特性",
+    "Ship": "舰船",
+    "Ship Size": "舰船尺寸",
+    "Starbase Building": "恒星基地建筑",
+    "Starbase Module": "恒星基地模块",
+    "Starbase Upgrade": "恒星基地升级",
+    "Army": "陆军",
+    "Policy": "政策",
+    "Planetary Feature": "行星特征",
+    "Tradition": "传统",
+    "Ascension Perk": "飞升天赋",
+    "Decision": "决议",
+    "Situation": "局势",
+    "Mega-Structure": "巨型结构",
+    "Reveals Ressource": "揭示资源",
+    "Reveals Resource": "揭示资源",
+}
+
+# CLI locale -> (game language directory, locale tag written to the payload).
+_LOCALES = {
+    "zh-hans": ("simp_chinese", "zh-Hans"),
+    "ja": ("japanese", "ja"),
+    "ko": ("korean", "ko"),
+    "ru": ("russian", "ru"),
+    "de": ("german", "de"),
+    "fr": ("french", "fr"),
+    "es": ("spanish", "es"),
+    "pl": ("polish", "pl"),
+    "pt-br": ("braz_por", "pt-BR"),
+}
+# The hand-written rules below (type names, DSL keywords, overrides, fixes)
+# produce Chinese; other targets only get official strings and phrases.
+_HAND_RULE_LANGUAGES = {"simp_chinese"}
+
+_MANUAL_LINE_OVERRIDES = {
+    "One must be true\n    •   Has Spiritualist Ethic\n    •   Has Fanatic Spiritualist Ethic\n    •   All must be true\n\t    •   Does NOT have Gestalt Consciousness Ethic\n\t    •   Is a Member of a spiritualist Federation with perk 'A Union of Faith'":
+        "以下条件至少一个满足\n    •   拥有 唯心主义 思潮\n    •   拥有 极端唯心主义 思潮\n    •   以下条件全部满足\n\t    •   没有 格式塔意识 思潮\n\t    •   是拥有“信仰同盟”特典的唯心主义联邦成员",
+    "(×<b style='color:red'>0.025</b>) Does NOT have Crisis level: Calamity":
+        "(×<b style='color:red'>0.025</b>) 没有 危机等级: 灾厄",
+    "(×<b style='color:red'>0.025</b>) Does NOT have Crisis level: Existential Threat":
+        "(×<b style='color:red'>0.025</b>) 没有 危机等级: 生存威胁",
+    "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Any Owned Planet<br/>\t    •   One must be true<br/>\t\t    •   Has deposit Isolated Valley<br/>\t\t    •   Has deposit Avian Reserve<br/>\t\t    •   Any owned Population Group:<br/>\t\t\t    •   One must be true<br/>\t\t\t\t    •   Pop is NOT Sapient<br/>\t\t\t\t    •   Is livestock<br/>\t\t\t\t    •   Is TODO":
+        "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   任意所属行星<br/>\t    •   以下条件至少一个满足<br/>\t\t    •   拥有矿藏 偏僻山谷<br/>\t\t    •   拥有矿藏 鸟类保护区<br/>\t\t    •   任意 已拥有 人口 团体:<br/>\t\t\t    •   以下条件至少一个满足<br/>\t\t\t\t    •   人口 不是 智慧物种<br/>\t\t\t\t    •   是 牲畜<br/>\t\t\t\t    •   是 待定",
+    "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Has Crisis level: Calamity<br/>    •   Has Enigmatic Engineering Ascension Perk":
+        "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   拥有 危机等级: 灾厄<br/>    •   拥有 天机工程 飞升天赋",
+    "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Has Crisis level: Existential Threat<br/>    •   Has Enigmatic Engineering Ascension Perk":
+        "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   拥有 危机等级: 生存威胁<br/>    •   拥有 天机工程 飞升天赋",
+    "(×<b style='color:red'>0.1</b>) Number of buildings lower than 1<br/>    •   Type is Faculty of Archaeostudies<br/>    •   Is NOT disabled<br/>    •   Is NOT in construction":
+        "(×<b style='color:red'>0.1</b>) 建筑数量小于 1<br/>    •   类型是 远古学院<br/>    •   未禁用<br/>    •   不在建造中",
+    "<b>Component</b>: Bio-Hyperlane Field III":
+        "<b>组件</b>：生物超空间航道场 III",
+    "<b>Component</b>: Hyper Drive III":
+        "<b>组件</b>：超空间引擎 III",
+    "One must be true\n    •   One must be true\n\t    •   Has encountered Tiyanki\n\t    •   Has encountered Space Amoeba\n\t    •   Has encountered Crystalline Entity\n\t    •   Has encountered Voidworms\n\t    •   Has encountered Cuthuloids\n    •   One must be true\n\t    •   Has Government Civic: Beastmasters\n\t    •   Has Government Civic: Wild Swarm\n\t    •   Has Government Civic: Biodrones\n\t    •   Has Government Civic: Space Ranchers":
+        "以下条件至少一个满足\n    •   以下条件至少一个满足\n\t    •   遭遇过 缇扬奇\n\t    •   遭遇过 太空变形虫\n\t    •   遭遇过 晶态实体\n\t    •   遭遇过 虚空虫\n\t    •   遭遇过 克苏鲁体\n    •   以下条件至少一个满足\n\t    •   拥有 政府 国民理念: 万兽之王\n\t    •   拥有 政府 国民理念: 荒野蜂群\n\t    •   拥有 政府 国民理念: 生态无人机\n\t    •   拥有 政府 国民理念: 太空牧场",
+}
+
+
+def _fix_translated_line(raw_line: str, translated: str) -> str:
+    fixed = translated
+    if "A Union of Faith" in raw_line:
+        fixed = (
+            "以下条件至少一个满足\n"
+            "    •   拥有 唯心主义 思潮\n"
+            "    •   拥有 极端唯心主义 思潮\n"
+            "    •   以下条件全部满足\n"
+            "\t    •   没有 格式塔意识 思潮\n"
+            "\t    •   是拥有“信仰同盟”特典的唯心主义联邦成员"
+        )
+    if raw_line.startswith("(×<b style='color:red'>0.1</b>) Number of buildings lower than 1"):
+        fixed = (
+            "(×<b style='color:red'>0.1</b>) 建筑数量小于 1<br/>"
+            "    •   类型是 远古学院<br/>"
+            "    •   未禁用<br/>"
+            "    •   不在建造中"
+        )
+    if raw_line == "<b>Component</b>: Bio-Hyperlane Field III":
+        fixed = "<b>组件</b>：生物超空间航道场 III"
+    if raw_line == "<b>Component</b>: Hyper Drive III":
+        fixed = "<b>组件</b>：超空间引擎 III"
+    if "Has encountered Cuthuloids" in raw_line:
+        fixed = (
+            "以下条件至少一个满足\n"
+            "    •   以下条件至少一个满足\n"
+            "\t    •   遭遇过 缇扬奇\n"
+            "\t    •   遭遇过 太空变形虫\n"
+            "\t    •   遭遇过 晶态实体\n"
+            "\t    •   遭遇过 虚空虫\n"
+            "\t    •   遭遇过 克苏鲁体\n"
+            "    •   以下条件至少一个满足\n"
+            "\t    •   拥有 政府 国民理念: 万兽之王\n"
+            "\t    •   拥有 政府 国民理念: 荒野蜂群\n"
+            "\t    •   拥有 政府 国民理念: 生态无人机\n"
+            "\t    •   拥有 政府 国民理念: 太空牧场"
+        )
+    if "AI Personality is Xenophobic Isolationists" in raw_line:
+        fixed = fixed.replace("不 AI性格 是 排外孤立主义", "AI性格不是排外孤立主义")
+    if raw_line == "The Empire Size Effect is modified by: -5%":
+        fixed = "帝国规模效应修正为: -5%"
+    fixed = fixed.replace("天灾 等级", "危机等级")
+    fixed = fixed.replace("卡拉姆ity", "灾厄")
+    fixed = fixed.replace("Existential 威胁", "生存威胁")
+    fixed = fixed.replace("Pop 不是 智慧", "人口 不是 智慧物种")
+    fixed = fixed.replace("是 livestock", "是 牲畜")
+    fixed = fixed.replace("是 TODO", "是 待定")
+    fixed = fixed.replace(" 建造花费", "建造花费")
+    fixed = fixed.replace(" 建造速度", "建造速度")
+    return fixed
+
+
+def _collect_tech_keys(nodes: list[dict]) -> list[str]:
+    return sorted({n.get("key") for n in nodes if isinstance(n.get("key"), str)})
+
+
+def _collect_categories(nodes: list[dict]) -> set[str]:
+    categories: set[str] = set()
+    for n in nodes:
+        c = n.get("category")
+        if isinstance(c, str) and c:
+            categories.add(c)
+    return categories
 
-    if not version_dir.exists():
-        _eprint(f"ERROR: 版本目录不存在：{version_dir}")
-        return 2
 
-    nodes = _collect_nodes(version_dir)
-    tech_keys = sorted({n.get("key") for n in nodes if isinstance(n.get("key"), str)})
+def _collect_lines(nodes: list[dict]) -> set[str]:
+    all_lines: set[str] = set()
+    for n in nodes:
+        for field in LINE_FIELDS:
+            arr = n.get(field)
+            if not isinstance(arr, list):
+                continue
+            for item in arr:
+                if isinstance(item, str) and item:
+                    all_lines.add(item)
+    return all_lines
 
-    en = _parse_localisation_dir(en_dir)
-    zh = _parse_localisation_dir(zh_dir)
-    rev_en = _build_reverse_value_map(en)
-    _, resolve_zh_text = _make_resolver(zh)
 
+def _build_tech_map(
+    tech_keys: list[str],
+    zh: Mapping[str, str],
+    resolve_zh_text,
+) -> tuple[dict[str, dict[str, str]], int, int]:
     tech_map: dict[str, dict[str, str]] = {}
     missing_name = 0
     missing_desc = 0
@@ -678,19 +920,24 @@ def main(argv: list[str]) -> int:
             entry["description"] = resolve_zh_text(desc)
         if entry:
             tech_map[key] = entry
+    return tech_map, missing_name, missing_desc
 
-    categories: set[str] = set()
-    for n in nodes:
-        c = n.get("category")
-        if isinstance(c, str) and c:
-            categories.add(c)
 
+def _build_category_map(
+    categories: set[str],
+    rev_en: ReverseIndex | Mapping[str, str],
+    zh: Mapping[str, str],
+    resolve_zh_text,
+) -> dict[str, str]:
     category_map: dict[str, str] = {}
     for c in sorted(categories):
         lk = rev_en.get(c)
         if lk and lk in zh:
             category_map[c] = resolve_zh_text(zh[lk])
+    return category_map
+
 
+def _mine_phrase_map(en: Mapping[str, str], zh: Mapping[str, str], resolve_zh_text) -> dict[str, str]:
     phrase_map: dict[str, str] = {}
     for key, en_text in en.items():
         zh_raw = zh.get(key)
@@ -699,7 +946,16 @@ def main(argv: list[str]) -> int:
         zh_text = resolve_zh_text(zh_raw)
         if _safe_phrase(en_text, zh_text):
             phrase_map.setdefault(en_text, zh_text)
+    return phrase_map
 
+
+def _build_phrase_pairs(
+    official_phrases: dict[str, str],
+    nodes: list[dict],
+    tech_map: dict[str, dict[str, str]],
+    category_map: dict[str, str],
+) -> list[tuple[str, str]]:
+    phrase_map = dict(official_phrases)
     for n in nodes:
         node_key = n.get("key")
         node_name = n.get("name")
@@ -714,31 +970,18 @@ def main(argv: list[str]) -> int:
     for en_cat, zh_cat in category_map.items():
         phrase_map.setdefault(en_cat, zh_cat)
 
-    phrase_pairs = sorted(phrase_map.items(), key=lambda kv: len(kv[0]), reverse=True)
-
-    type_map = {
-        "Building": "建筑",
-        "Component": "组件",
-        "Edict": "法令",
-        "Feature": "特性",
-        "Ship": "舰船",
-        "Ship Size": "舰船尺寸",
-        "Starbase Building": "恒星基地建筑",
-        "Starbase Module": "恒星基地模块",
-        "Starbase Upgrade": "恒星基地升级",
-        "Army": "陆军",
-        "Policy": "政策",
-        "Planetary Feature": "行星特征",
-        "Tradition": "传统",
-        "Ascension Perk": "飞升天赋",
-        "Decision": "决议",
-        "Situation": "局势",
-        "Mega-Structure": "巨型结构",
-        "Reveals Ressource": "揭示资源",
-        "Reveals Resource": "揭示资源",
-    }
+    return sorted(phrase_map.items(), key=lambda kv: len(kv[0]), reverse=True)
 
-    unlock_re = re.compile(r"^\s*<b>([^<]+)</b>\s*:\s*(.+?)\s*$")
+
+def _make_line_translator(
+    rev_en: ReverseIndex | Mapping[str, str],
+    zh: Mapping[str, str],
+    resolve_zh_text,
+    phrase_pairs: list[tuple[str, str]],
+    hand_rules: bool = True,
+):
+    type_map = _TYPE_MAP if hand_rules else {}
+    type_sep = "：" if hand_rules else ": "
 
     def translate_value(en_text: str) -> str | None:
         lk = rev_en.get(en_text)
@@ -783,20 +1026,20 @@ def main(argv: list[str]) -> int:
         return None
 
     def translate_line_exact(line: str) -> str | None:
-        m = unlock_re.match(line)
+        m = UNLOCK_RE.match(line)
         if m:
             line_type = m.group(1).strip()
             item = m.group(2).strip()
             line_type_zh = type_map.get(line_type, line_type)
-            item_zh = translate_sized_item(item)
+            item_zh = translate_sized_item(item) if hand_rules else None
             if item_zh:
-                return f"<b>{line_type_zh}</b>：{item_zh}"
+                return f"<b>{line_type_zh}</b>{type_sep}{item_zh}"
             for candidate in alias_unlock_items(item):
                 item_zh = translate_value(candidate)
                 if item_zh:
-                    return f"<b>{line_type_zh}</b>：{item_zh}"
+                    return f"<b>{line_type_zh}</b>{type_sep}{item_zh}"
             if line_type_zh != line_type:
-                return f"<b>{line_type_zh}</b>：{item}"
+                return f"<b>{line_type_zh}</b>{type_sep}{item}"
             return None
 
         whole = translate_value(line)
@@ -804,127 +1047,604 @@ def main(argv: list[str]) -> int:
             return whole
         return None
 
-    all_lines: set[str] = set()
-    line_map: dict[str, str] = {}
-    for n in nodes:
-        for field in ("feature_unlocks", "potential", "weight_modifiers"):
-            arr = n.get(field)
-            if not isinstance(arr, list):
-                continue
-            for item in arr:
-                if not isinstance(item, str) or not item:
-                    continue
-                all_lines.add(item)
-                translated = translate_line_exact(item)
-                if translated and translated != item:
-                    line_map[item] = _apply_dsl_keywords(_normalize_mixed_line(translated))
-
-    for raw_line in sorted(all_lines):
-        if raw_line in line_map:
-            continue
-        translated = _apply_official_phrases(raw_line, phrase_pairs, type_map)
-        translated = _apply_dsl_keywords(_normalize_mixed_line(translated))
-        if translated != raw_line:
-            line_map[raw_line] = translated
-
-    manual_line_overrides = {
-        "One must be true\n    •   Has Spiritualist Ethic\n    •   Has Fanatic Spiritualist Ethic\n    •   All must be true\n\t    •   Does NOT have Gestalt Consciousness Ethic\n\t    •   Is a Member of a spiritualist Federation with perk 'A Union of Faith'":
-            "以下条件至少一个满足\n    •   拥有 唯心主义 思潮\n    •   拥有 极端唯心主义 思潮\n    •   以下条件全部满足\n\t    •   没有 格式塔意识 思潮\n\t    •   是拥有“信仰同盟”特典的唯心主义联邦成员",
-        "(×<b style='color:red'>0.025</b>) Does NOT have Crisis level: Calamity":
-            "(×<b style='color:red'>0.025</b>) 没有 危机等级: 灾厄",
-        "(×<b style='color:red'>0.025</b>) Does NOT have Crisis level: Existential Threat":
-            "(×<b style='color:red'>0.025</b>) 没有 危机等级: 生存威胁",
-        "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Any Owned Planet<br/>\t    •   One must be true<br/>\t\t    •   Has deposit Isolated Valley<br/>\t\t    •   Has deposit Avian Reserve<br/>\t\t    •   Any owned Population Group:<br/>\t\t\t    •   One must be true<br/>\t\t\t\t    •   Pop is NOT Sapient<br/>\t\t\t\t    •   Is livestock<br/>\t\t\t\t    •   Is TODO":
-            "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   任意所属行星<br/>\t    •   以下条件至少一个满足<br/>\t\t    •   拥有矿藏 偏僻山谷<br/>\t\t    •   拥有矿藏 鸟类保护区<br/>\t\t    •   任意 已拥有 人口 团体:<br/>\t\t\t    •   以下条件至少一个满足<br/>\t\t\t\t    •   人口 不是 智慧物种<br/>\t\t\t\t    •   是 牲畜<br/>\t\t\t\t    •   是 待定",
-        "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Has Crisis level: Calamity<br/>    •   Has Enigmatic Engineering Ascension Perk":
-            "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   拥有 危机等级: 灾厄<br/>    •   拥有 天机工程 飞升天赋",
-        "(×<b style='color:red'>0.0</b>) All must be false<br/>    •   Has Crisis level: Existential Threat<br/>    •   Has Enigmatic Engineering Ascension Perk":
-            "(×<b style='color:red'>0.0</b>) 以下条件全部为否<br/>    •   拥有 危机等级: 生存威胁<br/>    •   拥有 天机工程 飞升天赋",
-        "(×<b style='color:red'>0.1</b>) Number of buildings lower than 1<br/>    •   Type is Faculty of Archaeostudies<br/>    •   Is NOT disabled<br/>    •   Is NOT in construction":
-            "(×<b style='color:red'>0.1</b>) 建筑数量小于 1<br/>    •   类型是 远古学院<br/>    •   未禁用<br/>    •   不在建造中",
-        "<b>Component</b>: Bio-Hyperlane Field III":
-            "<b>组件</b>：生物超空间航道场 III",
-        "<b>Component</b>: Hyper Drive III":
-            "<b>组件</b>：超空间引擎 III",
-        "One must be true\n    •   One must be true\n\t    •   Has encountered Tiyanki\n\t    •   Has encountered Space Amoeba\n\t    •   Has encountered Crystalline Entity\n\t    •   Has encountered Voidworms\n\t    •   Has encountered Cuthuloids\n    •   One must be true\n\t    •   Has Government Civic: Beastmasters\n\t    •   Has Government Civic: Wild Swarm\n\t    •   Has Government Civic: Biodrones\n\t    •   Has Government Civic: Space Ranchers":
-            "以下条件至少一个满足\n    •   以下条件至少一个满足\n\t    •   遭遇过 缇扬奇\n\t    •   遭遇过 太空变形虫\n\t    •   遭遇过 晶态实体\n\t    •   遭遇过 虚空虫\n\t    •   遭遇过 克苏鲁体\n    •   以下条件至少一个满足\n\t    •   拥有 政府 国民理念: 万兽之王\n\t    •   拥有 政府 国民理念: 荒野蜂群\n\t    •   拥有 政府 国民理念: 生态无人机\n\t    •   拥有 政府 国民理念: 太空牧场",
-    }
-    line_map.update(manual_line_overrides)
-
-    for raw_line, translated in list(line_map.items()):
-        fixed = translated
-        if "A Union of Faith" in raw_line:
-            fixed = (
-                "以下条件至少一个满足\n"
-                "    •   拥有 唯心主义 思潮\n"
-                "    •   拥有 极端唯心主义 思潮\n"
-                "    •   以下条件全部满足\n"
-                "\t    •   没有 格式塔意识 思潮\n"
-                "\t    •   是拥有“信仰同盟”特典的唯心主义联邦成员"
-            )
-        if raw_line.startswith("(×<b style='color:red'>0.1</b>) Number of buildings lower than 1"):
-            fixed = (
-                "(×<b style='color:red'>0.1</b>) 建筑数量小于 1<br/>"
-                "    •   类型是 远古学院<br/>"
-                "    •   未禁用<br/>"
-                "    •   不在建造中"
-            )
-        if raw_line == "<b>Component</b>: Bio-Hyperlane Field III":
-            fixed = "<b>组件</b>：生物超空间航道场 III"
-        if raw_line == "<b>Component</b>: Hyper Drive III":
-            fixed = "<b>组件</b>：超空间引擎 III"
-        if "Has encountered Cuthuloids" in raw_line:
-            fixed = (
-                "以下条件至少一个满足\n"
-                "    •   以下条件至少一个满足\n"
-                "\t    •   遭遇过 缇扬奇\n"
-                "\t    •   遭遇过 太空变形虫\n"
-                "\t    •   遭遇过 晶态实体\n"
-                "\t    •   遭遇过 虚空虫\n"
-                "\t    •   遭遇过 克苏鲁体\n"
-                "    •   以下条件至少一个满足\n"
-                "\t    •   拥有 政府 国民理念: 万兽之王\n"
-                "\t    •   拥有 政府 国民理念: 荒野蜂群\n"
-                "\t    •   拥有 政府 国民理念: 生态无人机\n"
-                "\t    •   拥有 政府 国民理念: 太空牧场"
-            )
-        if "AI Personality is Xenophobic Isolationists" in raw_line:
-            fixed = fixed.replace("不 AI性格 是 排外孤立主义", "AI性格不是排外孤立主义")
-        if raw_line == "The Empire Size Effect is modified by: -5%":
-            fixed = "帝国规模效应修正为: -5%"
-        fixed = fixed.replace("天灾 等级", "危机等级")
-        fixed = fixed.replace("卡拉姆ity", "灾厄")
-        fixed = fixed.replace("Existential 威胁", "生存威胁")
-        fixed = fixed.replace("Pop 不是 智慧", "人口 不是 智慧物种")
-        fixed = fixed.replace("是 livestock", "是 牲畜")
-        fixed = fixed.replace("是 TODO", "是 待定")
-        fixed = fixed.replace(" 建造花费", "建造花费")
-        fixed = fixed.replace(" 建造速度", "建造速度")
-        line_map[raw_line] = fixed
-
-    payload = {
-        "version": str(args.phoenix_dir),
-        "locale": "zh-Hans",
-        "generatedAt": _dt.datetime.now(tz=_dt.timezone.utc).isoformat(),
+    # Multi-line conditions share a few hundred unique fragments, so the
+    # phrase/rule chain runs once per fragment and the tree is re-rendered.
+    fragments: dict[str, str] = {}
+
+    def translate_fragment(text: str) -> str:
+        translated = fragments.get(text)
+        if translated is None:
+            if hand_rules:
+                translated = _apply_official_phrases(text, phrase_pairs, _TYPE_MAP)
+                translated = _apply_dsl_keywords(_normalize_mixed_line(translated))
+            else:
+                translated = _apply_official_phrases(text, phrase_pairs, None)
+            fragments[text] = translated
+        return translated
+
+    def translate_structured(raw_line: str) -> str:
+        condition = parse_condition(raw_line)
+        if condition is None:
+            return translate_fragment(raw_line)
+        return condition.render(translate_fragment)
+
+    def translate_line_official(raw_line: str) -> str | None:
+        translated = translate_line_exact(raw_line)
+        if not translated or translated == raw_line:
+            translated = translate_structured(raw_line)
+        return None if translated == raw_line else translated
+
+    def translate_line(raw_line: str) -> str | None:
+        translated = translate_line_exact(raw_line)
+        if translated and translated != raw_line:
+            translated = _apply_dsl_keywords(_normalize_mixed_line(translated))
+        else:
+            translated = translate_structured(raw_line)
+            if translated == raw_line:
+                translated = None
+
+        translated = _MANUAL_LINE_OVERRIDES.get(raw_line, translated)
+        if translated is None:
+            return None
+        # One more pass over the finished line (overrides and fixes included),
+        # so the payload is what the page shows and it applies no rules itself.
+        return _normalize_mixed_line(_fix_translated_line(raw_line, translated))
+
+    return translate_line if hand_rules else translate_line_official
+
+
+# Below this many pending lines, starting a pool costs more than it saves.
+_PARALLEL_LINE_MIN = 512
+
+# Set in each pool worker by _init_line_worker.
+_worker_translate_line = None
+
+
+def _balanced_chunks(lines, count: int) -> list[list[str]]:
+    """Split ``lines`` into at most ``count`` chunks of similar total length.
+
+    Longest lines go first, each into the currently lightest chunk (lowest
+    index on ties), so the split depends only on the set of lines.
+    """
+    chunks: list[list[str]] = [[] for _ in range(count)]
+    loads = [(0, i) for i in range(count)]
+    for line in sorted(lines, key=lambda l: (-len(l), l)):
+        load, i = heapq.heappop(loads)
+        chunks[i].append(line)
+        heapq.heappush(loads, (load + len(line), i))
+    return [chunk for chunk in chunks if chunk]
+
+
+def _pool_context():
+    # Forked workers share the parsed tables copy-on-write; elsewhere the
+    # localisation is pickled once per worker through the initializer.
+    if sys.platform != "darwin" and "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _init_line_worker(
+    localisation: Localisation,
+    source: str,
+    target: str,
+    phrase_pairs: list[tuple[str, str]],
+    hand_rules: bool,
+) -> None:
+    global _worker_translate_line
+    _worker_translate_line = _make_line_translator(
+        localisation.reverse_map(source),
+        localisation.table(target),
+        localisation.resolve_text(target),
+        phrase_pairs,
+        hand_rules,
+    )
+
+
+def _translate_chunk(lines: list[str]) -> list[tuple[str, str | None]]:
+    return [(raw_line, _worker_translate_line(raw_line)) for raw_line in lines]
+
+
+def _build_payload(
+    version: str,
+    locale: str,
+    tech_map: dict[str, dict[str, str]],
+    category_map: dict[str, str],
+    line_map: dict[str, str],
+) -> dict:
+    return {
+        "version": version,
+        "locale": locale,
         "tech": tech_map,
         "category": category_map,
         "line": line_map,
     }
 
+
+def rules_paths() -> list[Path]:
+    scripts_dir = Path(__file__).resolve().parent
+    return [scripts_dir / f"{name}.py" for name in RULES_MODULES]
+
+
+def _rules_digest(paths: list[Path] | None = None) -> str:
+    h = hashlib.sha256()
+    for path in paths if paths is not None else rules_paths():
+        h.update(path.name.encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _line_phrase_digests(
+    lines: set[str],
+    phrase_pairs: list[tuple[str, str]],
+    official_phrases: dict[str, str],
+) -> dict[str, str]:
+    # Official phrases are covered by the localisation fingerprint; only the
+    # version-specific pairs (renamed techs) need to be part of a line's key,
+    # and only when they can match: their source occurs in the line, or in a
+    # replacement text that may be substituted into it.
+    extras = [pair for pair in phrase_pairs if pair[0] not in official_phrases]
+    always = [pair for pair in extras if any(pair[0] in dst for _, dst in phrase_pairs)]
+    digests: dict[str, str] = {}
+    for line in lines:
+        used = always + [pair for pair in extras if pair[0] in line and pair not in always]
+        digests[line] = (
+            hashlib.sha256(json.dumps(sorted(used), ensure_ascii=False).encode("utf-8")).hexdigest()
+            if used else ""
+        )
+    return digests
+
+
+def _write_payload(out_path: Path, payload: dict) -> None:
+    text = json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    if out_path.exists() and _read_text(out_path) == text:
+        return
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
+    out_path.write_text(text, encoding="utf-8")
+
+
+class BuildError(Exception):
+    pass
+
+
+class Localisation:
+    """Parsed game localisation, shared by every version and locale built in one process.
+
+    Language tables are parsed lazily into compact LocTables. With
+    ``keep_files`` each yml file keeps its own table, so ``refresh`` only
+    re-reads files whose mtime changed; otherwise only mtimes are kept and a
+    change re-parses the language. Reverse maps, resolvers and mined phrase
+    pairs are derived on demand and dropped when their tables change.
+    """
+
+    def __init__(self, root: Path, keep_files: bool = False) -> None:
+        self.root = root
+        self.keep_files = keep_files
+        self.generation = 0
+        self._files: dict[str, dict[Path, tuple[int, LocTable | None]]] = {}
+        self._tables: dict[str, LocTable] = {}
+        self._reverse: dict[str, ReverseIndex] = {}
+        self._resolvers: dict[str, object] = {}
+        self._phrases: dict[tuple[str, str], dict[str, str]] = {}
+        self._digests: dict[str, str] = {}
+
+    def __getstate__(self) -> dict:
+        # Resolvers are closures; workers rebuild them from the tables.
+        state = self.__dict__.copy()
+        state["_resolvers"] = {}
+        return state
+
+    @classmethod
+    def discover(cls, stellaris_dir: Path | None = None, keep_files: bool = False) -> Localisation:
+        stellaris_dir, loc_root = _discover_localisation_root(stellaris_dir)
+        if stellaris_dir is None:
+            raise BuildError(
+                "ERROR: 无法自动定位 Stellaris 安装目录。\n"
+                "请传入 --stellaris-dir，例如：\n"
+                r'  python scripts/build_phoenix_i18n.py --stellaris-dir "D:\SteamLibrary\steamapps\common\Stellaris"'
+            )
+        if not loc_root:
+            raise BuildError(f"ERROR: 在 {stellaris_dir} 下找不到 localisation/localization 目录。")
+        return cls(loc_root, keep_files)
+
+    def language_dir(self, language: str) -> Path:
+        return self.root / language
+
+    def _load(self, language: str) -> bool:
+        files = self._files.setdefault(language, {})
+        current = _iter_localisation_files(self.language_dir(language))
+        changed = False
+        for yml in current:
+            mtime = _mtime_ns(yml)
+            cached = files.get(yml)
+            if cached is None or cached[0] != mtime:
+                table = LocTable.from_pairs(_parse_localisation_file(yml).items()) if self.keep_files else None
+                files[yml] = (mtime, table)
+                changed = True
+        for yml in set(files) - set(current):
+            del files[yml]
+            changed = True
+
+        if changed or language not in self._tables:
+            if self.keep_files:
+                self._tables[language] = LocTable.merge(files[yml][1] for yml in current)
+            else:
+                self._tables[language] = LocTable.from_pairs(
+                    pair for yml in current for pair in _parse_localisation_file(yml).items()
+                )
+            self._reverse.pop(language, None)
+            self._resolvers.pop(language, None)
+            self._digests.pop(language, None)
+            for pair in [p for p in self._phrases if language in p]:
+                del self._phrases[pair]
+        return changed
+
+    def refresh(self) -> list[str]:
+        changed = [language for language in list(self._tables) if self._load(language)]
+        if changed:
+            self.generation += 1
+        return changed
+
+    def table(self, language: str) -> LocTable:
+        if language not in self._tables:
+            self._load(language)
+        return self._tables[language]
+
+    def reverse_map(self, language: str) -> ReverseIndex:
+        if language not in self._reverse:
+            self._reverse[language] = ReverseIndex(self.table(language))
+        return self._reverse[language]
+
+    def resolve_text(self, language: str):
+        if language not in self._resolvers:
+            _, self._resolvers[language] = _make_resolver(self.table(language))
+        return self._resolvers[language]
+
+    def fingerprint(self, source: str, target: str) -> str:
+        for language in (source, target):
+            if language not in self._digests:
+                self._digests[language] = self.table(language).digest()
+        return hashlib.sha256(
+            f"{source}:{self._digests[source]}\n{target}:{self._digests[target]}".encode("utf-8")
+        ).hexdigest()
+
+    def official_phrases(self, source: str, target: str) -> dict[str, str]:
+        pair = (source, target)
+        if pair not in self._phrases:
+            self._phrases[pair] = _mine_phrase_map(
+                self.table(source), self.table(target), self.resolve_text(target)
+            )
+        return self._phrases[pair]
+
+
+@dataclass
+class VersionData:
+    name: str
+    path: Path
+    nodes: list[dict]
+
+    @classmethod
+    def load(cls, version_dir: Path, name: str | None = None) -> VersionData:
+        if not version_dir.exists():
+            raise BuildError(f"ERROR: 版本目录不存在：{version_dir}")
+        return cls(name or version_dir.name, version_dir, _collect_nodes(version_dir))
+
+
+@dataclass
+class BuildResult:
+    version: str
+    locale: str
+    tech: dict[str, dict[str, str]]
+    category: dict[str, str]
+    line: dict[str, str]
+    tech_keys: int = 0
+    missing_name: int = 0
+    missing_desc: int = 0
+    categories: int = 0
+    lines: int = 0
+    phrase_pairs: int = 0
+    retranslated: int = 0
+    memory_lookups: int = 0
+    memory_hits: int = 0
+    memory_evicted: int = 0
+
+    def payload(self) -> dict:
+        return _build_payload(self.version, self.locale, self.tech, self.category, self.line)
+
+    def coverage(self) -> dict[str, tuple[int, int]]:
+        return {
+            "tech name": (self.tech_keys - self.missing_name, self.tech_keys),
+            "tech desc": (self.tech_keys - self.missing_desc, self.tech_keys),
+            "category": (len(self.category), self.categories),
+            "line": (len(self.line), self.lines),
+            "memory hits": (self.memory_hits, self.memory_lookups),
+        }
+
+    def print_summary(self) -> None:
+        print(f"Tech keys: {self.tech_keys}")
+        print(f"Tech translated (name/desc any): {len(self.tech)}")
+        print(f"Missing tech name: {self.missing_name}")
+        print(f"Missing tech desc: {self.missing_desc}")
+        print(f"Category translated: {len(self.category)} / {self.categories}")
+        print(f"Line translated: {len(self.line)} / {self.lines}")
+        print(f"Phrase pairs used: {self.phrase_pairs}")
+        if self.memory_lookups:
+            print(
+                f"Translation memory: {self.memory_hits} / {self.memory_lookups} hits "
+                f"({100.0 * self.memory_hits / self.memory_lookups:.1f}%), evicted {self.memory_evicted}"
+            )
+
+
+class Builder:
+    """Staged i18n builder: localisation is loaded once, versions are built on top of it.
+
+    Translated lines are cached per version and reused while the localisation
+    generation and the phrase pairs stay the same. With a translation memory,
+    lines missing from that cache are looked up there before translating.
+    Large batches of remaining lines are translated on up to ``jobs`` worker
+    processes; the result is the same as translating them one by one.
+    """
+
+    def __init__(
+        self,
+        localisation: Localisation,
+        source: str = "english",
+        target: str = "simp_chinese",
+        locale: str = "zh-Hans",
+        memory: TranslationMemory | None = None,
+        jobs: int | None = None,
+    ) -> None:
+        for language in (source, target):
+            if not localisation.language_dir(language).exists():
+                raise BuildError(
+                    f"ERROR: 找不到语言目录：{localisation.language_dir(source)} "
+                    f"或 {localisation.language_dir(target)}"
+                )
+        self.localisation = localisation
+        self.source = source
+        self.target = target
+        self.locale = locale
+        self.hand_rules = target in _HAND_RULE_LANGUAGES
+        self.memory = memory
+        self.jobs = jobs
+        self.rules = _rules_digest()
+        self._line_caches: dict[str, tuple[int, list[tuple[str, str]], dict[str, str | None]]] = {}
+
+    @classmethod
+    def for_locale(
+        cls,
+        localisation: Localisation,
+        locale: str,
+        source: str = "english",
+        memory: TranslationMemory | None = None,
+        jobs: int | None = None,
+    ) -> Builder:
+        if locale not in _LOCALES:
+            raise BuildError(f"ERROR: 不支持的语言：{locale}（可选：{', '.join(_LOCALES)}）")
+        target, tag = _LOCALES[locale]
+        return cls(localisation, source=source, target=target, locale=tag, memory=memory, jobs=jobs)
+
+    def build(self, version: VersionData) -> BuildResult:
+        loc = self.localisation
+        target = loc.table(self.target)
+        rev_source = loc.reverse_map(self.source)
+        resolve_target_text = loc.resolve_text(self.target)
+
+        tech_keys = _collect_tech_keys(version.nodes)
+        tech_map, missing_name, missing_desc = _build_tech_map(tech_keys, target, resolve_target_text)
+        categories = _collect_categories(version.nodes)
+        category_map = _build_category_map(categories, rev_source, target, resolve_target_text)
+        official_phrases = loc.official_phrases(self.source, self.target)
+        phrase_pairs = _build_phrase_pairs(official_phrases, version.nodes, tech_map, category_map)
+
+        all_lines = _collect_lines(version.nodes)
+        wanted = all_lines | set(_MANUAL_LINE_OVERRIDES) if self.hand_rules else set(all_lines)
+        cached = self._line_caches.get(version.name)
+        if cached is None or cached[0] != loc.generation or cached[1] != phrase_pairs:
+            cached = (loc.generation, phrase_pairs, {})
+            self._line_caches[version.name] = cached
+        line_cache = cached[2]
+
+        pending = wanted - set(line_cache)
+        memory_hits = memory_evicted = 0
+        if pending and self.memory is not None:
+            fingerprint = loc.fingerprint(self.source, self.target)
+            phrases = _line_phrase_digests(pending, phrase_pairs, official_phrases)
+            memory_evicted = self.memory.use(self.source, self.target, fingerprint, self.rules)
+            found = self.memory.get_many(phrases, fingerprint, self.rules)
+            line_cache.update(found)
+            memory_hits = len(found)
+            misses = pending - found.keys()
+        else:
+            misses = pending
+        if misses:
+            line_cache.update(self._translate_lines(misses, phrase_pairs))
+            if self.memory is not None:
+                self.memory.put_many(
+                    ((raw_line, phrases[raw_line], line_cache[raw_line]) for raw_line in misses),
+                    fingerprint,
+                    self.rules,
+                )
+
+        line_map = {
+            raw_line: line_cache[raw_line]
+            for raw_line in sorted(wanted)
+            if line_cache[raw_line] is not None
+        }
+
+        return BuildResult(
+            version=version.name,
+            locale=self.locale,
+            tech=tech_map,
+            category=category_map,
+            line=line_map,
+            tech_keys=len(tech_keys),
+            missing_name=missing_name,
+            missing_desc=missing_desc,
+            categories=len(categories),
+            lines=len(all_lines),
+            phrase_pairs=len(phrase_pairs),
+            retranslated=len(misses),
+            memory_lookups=len(pending) if self.memory is not None else 0,
+            memory_hits=memory_hits,
+            memory_evicted=memory_evicted,
+        )
+
+    def _translate_lines(self, lines: set[str], phrase_pairs: list[tuple[str, str]]) -> dict[str, str | None]:
+        loc = self.localisation
+        workers = min(self.jobs or os.cpu_count() or 1, len(lines) // (_PARALLEL_LINE_MIN // 2) or 1)
+        if workers <= 1 or len(lines) < _PARALLEL_LINE_MIN:
+            translate_line = _make_line_translator(
+                loc.reverse_map(self.source),
+                loc.table(self.target),
+                loc.resolve_text(self.target),
+                phrase_pairs,
+                self.hand_rules,
+            )
+            return {raw_line: translate_line(raw_line) for raw_line in lines}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        loc.reverse_map(self.source)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_pool_context(),
+            initializer=_init_line_worker,
+            initargs=(loc, self.source, self.target, phrase_pairs, self.hand_rules),
+        ) as pool:
+            translated: dict[str, str | None] = {}
+            for chunk in pool.map(_translate_chunk, _balanced_chunks(lines, workers)):
+                translated.update(chunk)
+        return translated
+
+    def write(self, result: BuildResult, out_path: Path) -> Path:
+        _write_payload(out_path, result.payload())
+        return out_path
+
+
+def _build_versions(builder: Builder, versions: list[VersionData]) -> list[BuildResult]:
+    return [builder.build(version) for version in versions]
+
+
+def build_locales(
+    localisation: Localisation,
+    versions: list[VersionData],
+    locales: list[str],
+    jobs: int | None = None,
+    memory: TranslationMemory | None = None,
+) -> dict[str, list[BuildResult]]:
+    """Build every version for every locale, one worker process per locale.
+
+    The source language is parsed and reverse-indexed here, once, and shipped
+    to the workers; each worker only parses its own target language. A single
+    locale instead spreads its line translation over ``jobs`` processes.
+    """
+    builders = {
+        locale: Builder.for_locale(localisation, locale, memory=memory, jobs=jobs) for locale in locales
+    }
+    source = next(iter(builders.values())).source
+    localisation.reverse_map(source)
+
+    workers = min(len(locales), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        return {locale: _build_versions(builder, versions) for locale, builder in builders.items()}
+
+    for builder in builders.values():
+        builder.jobs = 1
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            locale: pool.submit(_build_versions, builder, versions)
+            for locale, builder in builders.items()
+        }
+        return {locale: future.result() for locale, future in futures.items()}
+
+
+def print_coverage(results: dict[str, list[BuildResult]]) -> None:
+    columns = ("tech name", "tech desc", "category", "line")
+    if any(r.memory_lookups for locale_results in results.values() for r in locale_results):
+        columns += ("memory hits",)
+    print(f"{'Locale':<8} {'Version':<18} " + " ".join(f"{c:>16}" for c in columns))
+    for locale, locale_results in results.items():
+        for result in locale_results:
+            cells = []
+            for done, total in (result.coverage()[c] for c in columns):
+                percent = 100.0 * done / total if total else 100.0
+                cells.append(f"{f'{done}/{total}':>9} {percent:5.1f}%")
+            print(f"{locale:<8} {result.version:<18} " + " ".join(cells))
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate version i18n.<locale>.json files from official Stellaris localisation."
+    )
+    parser.add_argument(
+        "--stellaris-dir",
+        type=Path,
+        default=None,
+        help="Path to Stellaris install directory (default: auto-detect Steam install).",
+    )
+    parser.add_argument(
+        "--phoenix-dir",
+        type=Path,
+        default=Path("phoenix-4.0.10"),
+        help="Version data directory (default: phoenix-4.0.10).",
     )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Output file for a single locale (default: <version dir>/i18n.<locale>.json).",
+    )
+    parser.add_argument(
+        "--locales",
+        nargs="+",
+        default=["zh-hans"],
+        help=f"Target locale(s), built in parallel: {', '.join(_LOCALES)} (default: zh-hans).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Maximum worker processes for --locales, or for line translation of a single locale (default: CPU count).",
+    )
+    parser.add_argument(
+        "--memory",
+        type=Path,
+        default=None,
+        help="Translation memory database (default: translation-memory.sqlite3 in the user config directory).",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Translate every line without reading or writing the translation memory.",
+    )
+    args = parser.parse_args(argv)
+
+    repo_root = Path(__file__).resolve().parents[1]
+    version_dir = (repo_root / args.phoenix_dir).resolve()
+    if args.out is not None and len(args.locales) != 1:
+        _eprint("ERROR: --out 只能与单个 --locales 一起使用。")
+        return 2
+
+    try:
+        localisation = Localisation.discover(args.stellaris_dir)
+        version = VersionData.load(version_dir, str(args.phoenix_dir))
+        memory = None if args.no_memory else TranslationMemory(args.memory or default_memory_path())
+        results = build_locales(localisation, [version], args.locales, args.jobs, memory)
+    except BuildError as e:
+        _eprint(e)
+        return 2
 
-    print(f"Written: {out_path}")
-    print(f"Tech keys: {len(tech_keys)}")
-    print(f"Tech translated (name/desc any): {len(tech_map)}")
-    print(f"Missing tech name: {missing_name}")
-    print(f"Missing tech desc: {missing_desc}")
-    print(f"Category translated: {len(category_map)} / {len(categories)}")
-    print(f"Line translated: {len(line_map)} / {len(all_lines)}")
-    print(f"Phrase pairs used: {len(phrase_pairs)}")
+    for locale, (result,) in results.items():
+        out_path = (repo_root / args.out).resolve() if args.out else version_dir / i18n_file_name(locale)
+        _write_payload(out_path, result.payload())
+        print(f"Written: {out_path}")
+    if len(results) == 1:
+        result.print_summary()
+    else:
+        print_coverage(results)
     return 0
 
 
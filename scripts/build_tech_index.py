@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+from pathlib import Path
+
+from versions import VERSION_AREA_FILE, find_versions, iter_techs, sorted_versions
+
+_INDEX_NAME = "tech-index.json"
+_FORMAT = 1
+
+# First byte of an encoded progress state.
+_RAW = 0
+_RUNS = 1
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+class TechIndex:
+    """Append-only mapping of tech keys to small integers, shared by every version.
+
+    Keys are numbered in the order they first appear, walking versions from
+    the oldest game version and each version's trees in page order. A key
+    keeps its index forever, including after it disappears from newer
+    versions, so a progress bitset stays valid across versions and rebuilds.
+    """
+
+    def __init__(self, keys: list[str] | None = None, versions: list[str] | None = None) -> None:
+        self.keys: list[str] = []
+        self.versions: list[str] = list(versions or [])
+        self._index: dict[str, int] = {}
+        for key in keys or []:
+            self.add(key)
+
+    @classmethod
+    def load(cls, path: Path) -> TechIndex:
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("format") != _FORMAT:
+            raise ValueError(f"unsupported {_INDEX_NAME} format: {data.get('format')}")
+        keys = data["keys"]
+        if len(set(keys)) != len(keys):
+            raise ValueError(f"duplicate keys in {path}")
+        return cls(keys, data.get("versions"))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getitem__(self, key: str) -> int:
+        return self._index[key]
+
+    def add(self, key: str) -> int:
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.keys)
+            self.keys.append(key)
+        return index
+
+    def add_version(self, version_dir: Path, name: str) -> int:
+        """Append the keys of one version directory; returns how many were new."""
+        before = len(self.keys)
+        for tech in iter_techs(version_dir):
+            if tech.get("key"):
+                self.add(tech["key"])
+        if name not in self.versions:
+            self.versions.append(name)
+        return len(self.keys) - before
+
+    def dumps(self) -> str:
+        # One key per line keeps the append-only history readable in diffs.
+        return json.dumps(
+            {"format": _FORMAT, "versions": self.versions, "keys": self.keys},
+            ensure_ascii=False,
+            indent=1,
+        ) + "\n"
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode_progress(indices) -> str:
+    """Encode a set of tech indices as a URL-safe string.
+
+    The bitset (bit ``i`` is ``byte[i >> 3] & (1 << (i & 7))``) is written
+    either as raw bytes or as alternating zero/one run lengths in LEB128,
+    whichever is shorter, after a one-byte tag. Mirrors encodeProgress in
+    assets/js/tech-tracking.js.
+    """
+    bits = sorted(set(indices))
+    raw = bytearray((bits[-1] >> 3) + 1 if bits else 0)
+    for i in bits:
+        raw[i >> 3] |= 1 << (i & 7)
+
+    runs = bytearray()
+    position = 0
+    i = 0
+    while i < len(bits):
+        j = i
+        while j + 1 < len(bits) and bits[j + 1] == bits[j] + 1:
+            j += 1
+        runs += _varint(bits[i] - position)
+        runs += _varint(j - i + 1)
+        position = bits[j] + 1
+        i = j + 1
+
+    data = bytes([_RUNS]) + runs if len(runs) < len(raw) else bytes([_RAW]) + raw
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_progress(code: str) -> list[int]:
+    data = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    if not data:
+        raise ValueError("empty progress state")
+    tag, body = data[0], data[1:]
+    if tag == _RAW:
+        return [i * 8 + bit for i, byte in enumerate(body) for bit in range(8) if byte & (1 << bit)]
+    if tag != _RUNS:
+        raise ValueError(f"unknown progress encoding: {tag}")
+    values = []
+    value = shift = 0
+    for byte in body:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value = shift = 0
+    if shift or len(values) % 2:
+        raise ValueError("truncated progress state")
+    out = []
+    position = 0
+    for gap, length in zip(values[::2], values[1::2]):
+        position += gap
+        out.extend(range(position, position + length))
+        position += length
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=f"Append new tech keys of every version to {_INDEX_NAME} (stable research-progress bit indices)."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=None,
+        help="Version directory name(s) to add (default: every version directory, oldest first).",
+    )
+    parser.add_argument(
+        "--decode",
+        metavar="STATE",
+        default=None,
+        help="Print the tech keys of an encoded progress state (the #research= URL fragment) and exit.",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    out_path = repo_root / _INDEX_NAME
+    try:
+        index = TechIndex.load(out_path)
+    except ValueError as e:
+        _eprint(f"ERROR: {e}")
+        return 2
+
+    if args.decode is not None:
+        try:
+            bits = decode_progress(args.decode)
+        except ValueError as e:
+            _eprint(f"ERROR: {e}")
+            return 2
+        for i in bits:
+            print(index.keys[i] if i < len(index) else f"#{i} (unknown)")
+        return 0
+
+    versions = args.version or find_versions(repo_root)
+    for version in versions:
+        if not (repo_root / version / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {repo_root / version}")
+            return 2
+    versions = sorted_versions(repo_root, versions)
+
+    for version in versions:
+        added = index.add_version(repo_root / version, version)
+        print(f"{version}: {added} new")
+
+    text = index.dumps()
+    if not out_path.exists() or out_path.read_text(encoding="utf-8") != text:
+        out_path.write_text(text, encoding="utf-8")
+    print(f"Written: {out_path} ({len(index)} keys)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
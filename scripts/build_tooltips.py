@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+from versions import VERSION_AREA_FILE, iter_techs
+
+_CHUNK_SIZE = 32
+
+# The fragments are rendered from the page's own #tooltip-template, with a
+# small interpreter for the jsrender tags it uses. Anything else in the
+# template is an error rather than a silently different fragment.
+_TEMPLATE_RE = re.compile(r'<script id="tooltip-template" type="text/x-jsrender">(.*?)</script>', re.DOTALL)
+_TAG_RE = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+_EXPR_RE = re.compile(
+    r"^(#data|[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)?"
+    r"(?:\.join\('([^'\\]*)'\))?"
+    r"(?:\s*(===|!==|>=|<=|>|<)\s*(-?\d+(?:\.\d+)?|true|false|null))?$"
+)
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _js_value(value: object) -> str:
+    # What jsrender's {{:value}} prints.
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ",".join(_js_value(item) for item in value)
+    return str(value)
+
+
+class _Expression:
+    """A jsrender expression limited to ``path``, ``path.length``, ``path.join('sep')`` and one comparison."""
+
+    def __init__(self, source: str) -> None:
+        m = _EXPR_RE.match(source.strip())
+        if m is None:
+            raise i18n.BuildError(f"ERROR: unsupported expression in #tooltip-template: {source.strip()}")
+        path, self.join, self.op, operand = m.groups()
+        self.path = [] if path in (None, "#data") else path.split(".")
+        if operand is not None:
+            self.operand = _LITERALS[operand] if operand in _LITERALS else float(operand)
+
+    def value(self, data: object) -> object:
+        for name in self.path:
+            if name == "length" and isinstance(data, (list, str)):
+                data = len(data)
+            elif isinstance(data, dict):
+                data = data.get(name)
+            else:
+                data = None
+        if self.join is not None:
+            data = self.join.join(_js_value(item) for item in data) if isinstance(data, list) else None
+        if self.op is None:
+            return data
+        if self.op in ("===", "!=="):
+            same = type(data) is type(self.operand) and data == self.operand
+            return same if self.op == "===" else not same
+        if not isinstance(data, (int, float)) or isinstance(data, bool):
+            return False
+        return {
+            ">": data > self.operand,
+            ">=": data >= self.operand,
+            "<": data < self.operand,
+            "<=": data <= self.operand,
+        }[self.op]
+
+
+def _js_truthy(value: object) -> bool:
+    # Arrays and objects are truthy in JavaScript even when empty.
+    return value is not None and value is not False and value != 0 and value != ""
+
+
+def _parse_template(markup: str) -> list:
+    """Parse template markup into text, ``(":", expr)``, ``("if", expr, body)`` and ``("for", expr, body)`` nodes."""
+    root: list = []
+    stack: list[tuple[str, list]] = [("", root)]
+    pos = 0
+    for m in _TAG_RE.finditer(markup):
+        if m.start() > pos:
+            stack[-1][1].append(markup[pos:m.start()])
+        pos = m.end()
+        tag = m.group(1)
+        name = re.match(r"(:|/?\w*)", tag).group(1)
+        if name == ":":
+            stack[-1][1].append((":", _Expression(tag[1:])))
+        elif name in ("if", "for"):
+            body: list = []
+            stack[-1][1].append((name, _Expression(tag[len(name):]), body))
+            stack.append((name, body))
+        elif name in ("/if", "/for") and stack[-1][0] == name[1:]:
+            stack.pop()
+        else:
+            raise i18n.BuildError(f"ERROR: unsupported tag in #tooltip-template: {m.group(0)}")
+    if len(stack) > 1:
+        raise i18n.BuildError(f"ERROR: unclosed {{{{{stack[-1][0]}}}}} in #tooltip-template")
+    root.append(markup[pos:])
+    return root
+
+
+def _render_nodes(nodes: list, data: object, out: list[str]) -> None:
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+        elif node[0] == ":":
+            out.append(_js_value(node[1].value(data)))
+        elif node[0] == "if":
+            if _js_truthy(node[1].value(data)):
+                _render_nodes(node[2], data, out)
+        else:
+            items = node[1].value(data)
+            for item in items if isinstance(items, list) else [] if items is None else [items]:
+                _render_nodes(node[2], item, out)
+
+
+def template_markup(repo_root: Path) -> str:
+    """The ``#tooltip-template`` markup of the repository's index.html."""
+    page = repo_root / "index.html"
+    m = _TEMPLATE_RE.search(page.read_text(encoding="utf-8"))
+    if m is None:
+        raise i18n.BuildError(f"ERROR: #tooltip-template not found in {page}")
+    return m.group(1)
+
+
+def load_template(repo_root: Path) -> list:
+    """Parse ``#tooltip-template``; raises BuildError on any tag the interpreter does not support."""
+    return _parse_template(template_markup(repo_root))
+
+
+class TooltipRenderer:
+    """Renders the `#tooltip-template` of index.html for one version and locale.
+
+    The tech is translated as _applyTooltipI18n in tech-tree.js does before
+    rendering, so a fragment is byte-for-byte what the page would render itself.
+    """
+
+    def __init__(self, payload: dict | None, template: list) -> None:
+        payload = payload or {}
+        self.template = template
+        self.tech_map: dict[str, dict[str, str]] = payload.get("tech") or {}
+        self.line_map: dict[str, str] = payload.get("line") or {}
+
+    def _line(self, line: str) -> str:
+        # As _lineMapValue: the line itself, then with "<br />" compacted.
+        if not line:
+            return line
+        for candidate in (line, line.replace("<br />", "<br/>")):
+            if candidate in self.line_map:
+                return self.line_map[candidate]
+        return line
+
+    def _lines_of(self, lines: object, dedupe: bool) -> object:
+        if not isinstance(lines, list) or not lines:
+            return lines
+        translated = [self._line(line) for line in lines]
+        return list(dict.fromkeys(translated)) if dedupe else translated
+
+    def _prerequisite(self, prerequisite: object) -> object:
+        if not isinstance(prerequisite, dict) or not prerequisite.get("key"):
+            return prerequisite
+        translated = self.tech_map.get(prerequisite["key"]) or {}
+        if translated.get("name"):
+            return dict(prerequisite, name=translated["name"])
+        return prerequisite
+
+    def data(self, tech: dict) -> dict:
+        """The translated copy of ``tech`` the template is rendered with."""
+        data = dict(tech)
+        tech_i18n = self.tech_map.get(tech.get("key") or "") or {}
+        if tech_i18n.get("description"):
+            data["description"] = tech_i18n["description"]
+        data["weight_modifiers"] = self._lines_of(tech.get("weight_modifiers"), False)
+        data["potential"] = self._lines_of(tech.get("potential"), False)
+        data["feature_unlocks"] = self._lines_of(tech.get("feature_unlocks"), True)
+        if isinstance(tech.get("prerequisites_names"), list):
+            data["prerequisites_names"] = [self._prerequisite(p) for p in tech["prerequisites_names"]]
+        return data
+
+    def render(self, tech: dict) -> str:
+        out: list[str] = []
+        _render_nodes(self.template, self.data(tech), out)
+        return "".join(out)
+
+
+def tooltip_file_name(locale: str, chunk: int | None = None) -> str:
+    return f"tooltips.{locale}.json" if chunk is None else f"tooltips.{locale}.{chunk}.json"
+
+
+def _write_json(path: Path, data: object) -> None:
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return
+    path.write_text(text, encoding="utf-8")
+
+
+def write_tooltips(version_dir: Path, locale: str, payload: dict | None, chunk_size: int = _CHUNK_SIZE) -> int:
+    """Write the tooltip index and fragment chunks of one version; returns the number of fragments.
+
+    Techs are chunked in tree order, so neighbouring nodes usually share a chunk.
+    """
+    renderer = TooltipRenderer(payload, load_template(version_dir.parent))
+    fragments: dict[str, str] = {}
+    for tech in iter_techs(version_dir):
+        key = tech.get("key")
+        if key and key not in fragments:
+            fragments[key] = renderer.render(tech)
+
+    keys = list(fragments)
+    chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    index: dict[str, int] = {}
+    for n, chunk in enumerate(chunks):
+        _write_json(version_dir / tooltip_file_name(locale, n), {key: fragments[key] for key in chunk})
+        index.update((key, n) for key in chunk)
+    _write_json(version_dir / tooltip_file_name(locale), {"chunks": len(chunks), "index": index})
+
+    # Drop chunks left over from a larger previous build.
+    for path in version_dir.glob(f"tooltips.{locale}.*.json"):
+        chunk = path.name[len(f"tooltips.{locale}."):-len(".json")]
+        if chunk.isdigit() and int(chunk) >= len(chunks):
+            path.unlink()
+    return len(fragments)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Pre-render tech tooltips into <version>/tooltips.<locale>.json and its fragment chunks."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=["phoenix-4.0.10"],
+        help="Version directory name(s) (default: phoenix-4.0.10).",
+    )
+    parser.add_argument(
+        "--locales",
+        nargs="+",
+        default=["zh-hans"],
+        help="Locale(s) whose i18n.<locale>.json is applied (default: zh-hans).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=_CHUNK_SIZE,
+        help=f"Tooltips per fragment file (default: {_CHUNK_SIZE}).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    for version in args.version:
+        version_dir = repo_root / version
+        if not (version_dir / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {version_dir}")
+            return 2
+    for locale in args.locales:
+        if locale not in i18n._LOCALES:
+            _eprint(f"ERROR: unsupported locale: {locale} (choose from {', '.join(i18n._LOCALES)})")
+            return 2
+    if args.chunk_size < 1:
+        _eprint("ERROR: --chunk-size must be at least 1.")
+        return 2
+    try:
+        load_template(repo_root)
+    except i18n.BuildError as e:
+        _eprint(e)
+        return 2
+
+    for version in args.version:
+        version_dir = repo_root / version
+        for locale in args.locales:
+            i18n_path = version_dir / i18n.i18n_file_name(locale)
+            payload = None
+            if i18n_path.exists():
+                payload = json.loads(i18n._read_text(i18n_path))
+            else:
+                _eprint(f"WARNING: {i18n_path} not found, tooltips are rendered untranslated.")
+            count = write_tooltips(version_dir, locale, payload, args.chunk_size)
+            print(f"Written: {version_dir / tooltip_file_name(locale)} ({count} tooltips)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from build_tech_index import decode_progress, encode_progress
+
+# (tech indices, encoded state) pairs both encoders must produce and both
+# decoders must read back. Do not regenerate these from encode_progress:
+# they pin the wire format that shared links already use.
+VECTORS = [
+    ([], "AA"),                                         # raw, no bytes
+    ([0, 2, 5, 9, 12, 13, 15], "ACWy"),                 # raw bitset
+    ([5], "ACA"),                                       # raw, one byte beats a gap/length pair
+    (list(range(200)), "AQDIAQ"),                       # runs, length over 127
+    ([300, 301], "AawCAg"),                             # runs, gap over 127
+    ([0, 1, 2, 3, 200, 201, 202, 203, 204], "AQAExAEF"),  # runs, two runs
+]
+# States both decoders must reject: empty, unknown tag, truncated varint, odd value count.
+MALFORMED = ["", "Ag", "AYA", "AYAB"]
+
+# Evaluates the codec functions of tech-tracking.js and prints, as JSON, the
+# encoding of every index list and the decoding of every state.
+_NODE_SCRIPT = """
+const [source, inputJson] = process.argv.slice(1);
+eval(source);
+const input = JSON.parse(inputJson);
+console.log(JSON.stringify({
+    encoded: input.indices.map(encodeProgress),
+    decoded: input.codes.map(decodeProgress),
+}));
+"""
+_JS_FUNCTIONS = ("_pushVarint", "encodeProgress", "decodeProgress")
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _js_source(path: Path) -> str:
+    text = path.read_text(encoding="utf-8")
+    parts = []
+    for name in _JS_FUNCTIONS:
+        m = re.search(rf"^function {name}\(.*?^}}$", text, re.M | re.S)
+        if m is None:
+            raise LookupError(f"function {name} not found in {path}")
+        parts.append(m.group(0))
+    return "\n".join(parts)
+
+
+def _check(label: str, encode, decode) -> int:
+    failures = 0
+    for indices, code in VECTORS:
+        got = encode(indices)
+        if got != code:
+            failures += 1
+            print(f"FAIL: {label}: encode({indices[:8]}...) = {got!r}, expected {code!r}")
+        got = decode(code)
+        if got != indices:
+            failures += 1
+            print(f"FAIL: {label}: decode({code!r}) = {got}, expected {indices[:8]}...")
+    for code in MALFORMED:
+        got = decode(code)
+        if got is not None:
+            failures += 1
+            print(f"FAIL: {label}: decode({code!r}) = {got}, expected it to be rejected")
+    if not failures:
+        print(f"OK: {label}: {len(VECTORS)} vectors round trip, {len(MALFORMED)} malformed states rejected")
+    return failures
+
+
+def _python_decode(code: str) -> list[int] | None:
+    try:
+        return decode_progress(code)
+    except ValueError:
+        return None
+
+
+def main() -> int:
+    node = shutil.which("node")
+    if node is None:
+        _eprint("ERROR: node not found; it is needed to run tech-tracking.js.")
+        return 2
+    repo_root = Path(__file__).resolve().parents[1]
+    try:
+        source = _js_source(repo_root / "assets/js/tech-tracking.js")
+    except LookupError as e:
+        _eprint(f"ERROR: {e}")
+        return 2
+
+    failures = _check("build_tech_index.py", encode_progress, _python_decode)
+
+    codes = [code for _, code in VECTORS] + MALFORMED
+    input_json = json.dumps({"indices": [indices for indices, _ in VECTORS], "codes": codes})
+    out = subprocess.run([node, "-e", _NODE_SCRIPT, source, input_json], check=True, capture_output=True, text=True)
+    result = json.loads(out.stdout)
+    encoded = dict(zip(map(tuple, (indices for indices, _ in VECTORS)), result["encoded"]))
+    decoded = dict(zip(codes, result["decoded"]))
+    failures += _check("tech-tracking.js", lambda indices: encoded[tuple(indices)], decoded.__getitem__)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
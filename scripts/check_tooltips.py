@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+import build_tooltips
+from versions import VERSION_AREA_FILE, iter_techs
+
+# Renders every entry of "datas" in the input file with the page's jsrender
+# and writes the fragments, in order, to the output file.
+_NODE_SCRIPT = """
+global.window = global;
+const fs = require('fs');
+const [jsrenderPath, inPath, outPath] = process.argv.slice(1);
+const jsrender = require(jsrenderPath)(null);
+const input = JSON.parse(fs.readFileSync(inPath, 'utf8'));
+const template = jsrender.templates(input.markup);
+fs.writeFileSync(outPath, JSON.stringify(input.datas.map(data => template.render(data))));
+"""
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check that build_tooltips.py renders #tooltip-template exactly as jsrender does (needs node)."
+    )
+    parser.add_argument(
+        "--version",
+        nargs="+",
+        default=["phoenix-4.0.10"],
+        help="Version directory name(s) whose techs are rendered (default: phoenix-4.0.10).",
+    )
+    parser.add_argument(
+        "--locale",
+        default="zh-hans",
+        help="Locale whose i18n.<locale>.json is applied when present (default: zh-hans).",
+    )
+    args = parser.parse_args()
+
+    node = shutil.which("node")
+    if node is None:
+        _eprint("ERROR: node not found; it is needed to run jsrender.")
+        return 2
+    repo_root = Path(__file__).resolve().parents[1]
+    try:
+        markup = build_tooltips.template_markup(repo_root)
+        template = build_tooltips.load_template(repo_root)
+    except i18n.BuildError as e:
+        _eprint(e)
+        return 2
+
+    failures = 0
+    for version in args.version:
+        version_dir = repo_root / version
+        if not (version_dir / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {version_dir}")
+            return 2
+        i18n_path = version_dir / i18n.i18n_file_name(args.locale)
+        payload = json.loads(i18n._read_text(i18n_path)) if i18n_path.exists() else None
+        renderer = build_tooltips.TooltipRenderer(payload, template)
+        techs = list({tech["key"]: tech for tech in iter_techs(version_dir) if tech.get("key")}.values())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            in_path = Path(tmp) / "in.json"
+            out_path = Path(tmp) / "out.json"
+            in_path.write_text(
+                json.dumps({"markup": markup, "datas": [renderer.data(tech) for tech in techs]}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            subprocess.run(
+                [node, "-e", _NODE_SCRIPT, str(repo_root / "assets/vendor/jsrender.min.js"), str(in_path), str(out_path)],
+                check=True,
+            )
+            expected = json.loads(out_path.read_text(encoding="utf-8"))
+
+        mismatches = [tech["key"] for tech, html in zip(techs, expected) if renderer.render(tech) != html]
+        if mismatches:
+            failures += 1
+            print(f"FAIL: {version}: {len(mismatches)} / {len(techs)} tooltips differ from jsrender, e.g. {mismatches[0]}")
+        else:
+            print(f"OK: {version}: {len(techs)} tooltips match jsrender")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+from translation_memory import KEEP_GENERATIONS, TranslationMemory
+
+_SOURCE = "english"
+_TARGET = "simp_chinese"
+_FINGERPRINT = "check"
+_RAW = "Has Technology: Zero-Point Power"
+_TRANSLATED = "拥有科技：零点能源"
+
+
+def _check_module(memory: TranslationMemory, paths: list[Path], path: Path) -> str | None:
+    """Store a line, edit ``path`` and make sure the line is no longer served."""
+    before = i18n._rules_digest(paths)
+    memory.use(_SOURCE, _TARGET, _FINGERPRINT, before)
+    memory.put_many([(_RAW, "", _TRANSLATED)], _FINGERPRINT, before)
+    if memory.get_many({_RAW: ""}, _FINGERPRINT, before) != {_RAW: _TRANSLATED}:
+        return "the stored line is not served under unchanged rules"
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    after = i18n._rules_digest(paths)
+    if after == before:
+        return "editing it does not change the rules digest"
+    memory.use(_SOURCE, _TARGET, _FINGERPRINT, after)
+    if memory.get_many({_RAW: ""}, _FINGERPRINT, after):
+        return "a line stored under the old rules is still served"
+    # Another checkout still on the old rules keeps its lines.
+    if memory.get_many({_RAW: ""}, _FINGERPRINT, before) != {_RAW: _TRANSLATED}:
+        return "lines stored under the old rules were dropped right away"
+    return None
+
+
+def _check_eviction(path: Path) -> str | None:
+    """Use one generation more than is kept and make sure only the oldest is evicted."""
+    memory = TranslationMemory(path)
+    try:
+        rules = [f"rules-{n}" for n in range(KEEP_GENERATIONS + 1)]
+        for digest in rules:
+            memory.use(_SOURCE, _TARGET, _FINGERPRINT, digest)
+            memory.put_many([(_RAW, "", _TRANSLATED)], _FINGERPRINT, digest)
+        if memory.get_many({_RAW: ""}, _FINGERPRINT, rules[0]):
+            return f"more than {KEEP_GENERATIONS} generations are kept"
+        if any(memory.get_many({_RAW: ""}, _FINGERPRINT, digest) != {_RAW: _TRANSLATED} for digest in rules[1:]):
+            return "a recent generation was evicted"
+    finally:
+        memory.close()
+    return None
+
+
+def main() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        paths = [Path(shutil.copy2(path, tmp_dir / path.name)) for path in i18n.rules_paths()]
+        memory = TranslationMemory(tmp_dir / "translation-memory.sqlite3")
+        try:
+            for path in paths:
+                error = _check_module(memory, paths, path)
+                if error:
+                    failures += 1
+                    print(f"FAIL: {path.name}: {error}", file=sys.stderr)
+                else:
+                    print(f"OK: editing {path.name} invalidates the translation memory")
+        finally:
+            memory.close()
+        error = _check_eviction(tmp_dir / "eviction.sqlite3")
+        if error:
+            failures += 1
+            print(f"FAIL: eviction: {error}", file=sys.stderr)
+        else:
+            print(f"OK: only generations beyond the {KEEP_GENERATIONS} most recently used are evicted")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
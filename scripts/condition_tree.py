@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+_SEPARATOR_RE = re.compile(r"(<br\s*/?>|\n)")
+MULTIPLIER_RE = re.compile(r"^\(×<b[^>]*>[^<]*</b>\)\s*")
+_BULLET_RE = re.compile(r"^(\t*) {4}•   ")
+_OPERATOR_RE = re.compile(r"^(?:\(\+\)\s*)?(?:All|One)\s+must\s+be\s+(?:true|false)$", re.IGNORECASE)
+# "<b>Type</b>: Item" feature-unlock lines.
+UNLOCK_RE = re.compile(r"^\s*<b>([^<]+)</b>\s*:\s*(.+?)\s*$")
+
+
+@dataclass
+class ConditionNode:
+    """One physical line of a condition string.
+
+    ``prefix`` holds the separator and indentation exactly as they appeared
+    in the source (``"<br/>\\t    •   "``), so rendering reproduces the layout.
+    """
+
+    text: str
+    prefix: str = ""
+    depth: int = 0
+    children: list[ConditionNode] = field(default_factory=list)
+
+    @property
+    def is_operator(self) -> bool:
+        return bool(_OPERATOR_RE.match(self.text))
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+@dataclass
+class Condition:
+    """A parsed ``weight_modifiers``/``potential`` line: optional multiplier plus a tree."""
+
+    multiplier: str
+    root: ConditionNode
+
+    def fragments(self) -> list[str]:
+        """Text of every line, operators included, in source order."""
+        return [node.text for node in self.root.walk()]
+
+    def render(self, translate) -> str:
+        return self.multiplier + "".join(node.prefix + translate(node.text) for node in self.root.walk())
+
+
+def parse_condition(line: str) -> Condition | None:
+    """Split a multi-line condition string into its tree; ``None`` for single-line strings.
+
+    Bulleted lines nest by their tab depth; lines without a bullet continue
+    the previous line's level.
+    """
+    parts = _SEPARATOR_RE.split(line)
+    if len(parts) == 1:
+        return None
+
+    head = parts[0]
+    m = MULTIPLIER_RE.match(head)
+    multiplier = m.group(0) if m else ""
+    root = ConditionNode(head[len(multiplier):])
+    stack = [root]
+    for separator, text in zip(parts[1::2], parts[2::2]):
+        bullet = _BULLET_RE.match(text)
+        if bullet:
+            depth = len(bullet.group(1)) + 1
+            indent = bullet.group(0)
+        else:
+            depth = stack[-1].depth
+            indent = text[:len(text) - len(text.lstrip())]
+        node = ConditionNode(text[len(indent):], separator + indent, depth)
+        while len(stack) > 1 and stack[-1].depth >= depth:
+            stack.pop()
+        stack[-1].children.append(node)
+        stack.append(node)
+    return Condition(multiplier, root)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+import build_tooltips
+
+_VERSION_FILES = ("physics.json", "society.json", "engineering.json", "anomalies.json")
+
+
+class WatchSession:
+    def __init__(
+        self,
+        localisation: i18n.Localisation,
+        version_dir: Path,
+        version: str,
+        out_path: Path,
+        locale: str = "zh-hans",
+    ) -> None:
+        self.localisation = localisation
+        self.locale = locale
+        self.version_dir = version_dir
+        self.version_name = version
+        self.out_path = out_path
+        self.rules_paths = i18n.rules_paths()
+
+        self.rules_mtimes = self._rules_mtimes()
+        self.version_mtimes: dict[str, int] = {}
+        self.builder = i18n.Builder.for_locale(localisation, locale)
+        self.version: i18n.VersionData | None = None
+        self.line_map: dict[str, str] = {}
+        self.last_content: tuple | None = None
+
+    def _rules_mtimes(self) -> list[int]:
+        return [i18n._mtime_ns(path) for path in self.rules_paths]
+
+    def _reload_rules(self) -> bool:
+        try:
+            # RULES_MODULES lists dependencies first, so build_phoenix_i18n
+            # picks up the reloaded helpers when it is re-executed last.
+            for name in i18n.RULES_MODULES:
+                importlib.reload(sys.modules[name])
+        except Exception:
+            traceback.print_exc()
+            i18n._eprint("规则文件加载失败，继续使用上一次的规则。")
+            return False
+        # Parsed yml files stay valid; everything derived from the rules is rebuilt.
+        fresh = i18n.Localisation(self.localisation.root, keep_files=True)
+        fresh._files = self.localisation._files
+        self.localisation = fresh
+        self.builder = i18n.Builder.for_locale(self.localisation, self.locale)
+        return True
+
+    def _poll(self) -> bool:
+        changed = False
+        rules_mtimes = self._rules_mtimes()
+        if rules_mtimes != self.rules_mtimes:
+            self.rules_mtimes = rules_mtimes
+            changed = self._reload_rules() or changed
+
+        if self.localisation.refresh():
+            changed = True
+
+        version_mtimes = {name: i18n._mtime_ns(self.version_dir / name) for name in _VERSION_FILES}
+        if version_mtimes != self.version_mtimes or self.version is None:
+            # Record the mtimes only once the files parse: a half-written file
+            # fails here and is retried on the next poll.
+            self.version = i18n.VersionData.load(self.version_dir, self.version_name)
+            self.version_mtimes = version_mtimes
+            changed = True
+        return changed
+
+    def rebuild(self) -> None:
+        started = time.perf_counter()
+        result = self.builder.build(self.version)
+        changed_lines = sum(
+            1 for k in result.line.keys() | self.line_map.keys()
+            if result.line.get(k) != self.line_map.get(k)
+        )
+        self.line_map = result.line
+
+        content = (result.tech, result.category, result.line)
+        elapsed = time.perf_counter() - started
+        if content == self.last_content:
+            print(f"No output change ({elapsed:.2f}s)")
+            return
+        self.last_content = content
+
+        self.builder.write(result, self.out_path)
+        build_tooltips.write_tooltips(self.out_path.parent, self.locale, result.payload())
+        print(
+            f"Written: {self.out_path} ({elapsed:.2f}s, "
+            f"retranslated {result.retranslated} lines, {changed_lines} line entries changed)"
+        )
+
+    def run(self, interval: float) -> int:
+        self._poll()
+        self.rebuild()
+        rules = ", ".join(path.name for path in self.rules_paths)
+        print(f"Watching {self.version_dir}, {self.localisation.root} and {rules} ...")
+        try:
+            while True:
+                time.sleep(interval)
+                try:
+                    if self._poll():
+                        self.rebuild()
+                except Exception:
+                    traceback.print_exc()
+        except KeyboardInterrupt:
+            return 0
+
+
+def watch(
+    localisation: i18n.Localisation,
+    version_dir: Path,
+    version: str,
+    interval: float,
+    locale: str = "zh-hans",
+) -> int:
+    session = WatchSession(localisation, version_dir, version, version_dir / i18n.i18n_file_name(locale), locale)
+    return session.run(interval)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+from loc_table import ReverseIndex
+
+
+def _dict_tables(loc_root: Path, source: str, target: str) -> object:
+    en: dict[str, str] = {}
+    for yml in i18n._iter_localisation_files(loc_root / source):
+        en.update(i18n._parse_localisation_file(yml))
+    zh: dict[str, str] = {}
+    for yml in i18n._iter_localisation_files(loc_root / target):
+        zh.update(i18n._parse_localisation_file(yml))
+    rev_en = i18n._build_reverse_value_map(en)
+    resolve_key, resolve_zh_text = i18n._make_resolver(zh)
+    phrases = i18n._mine_phrase_map(en, zh, resolve_zh_text)
+    return en, zh, rev_en, resolve_key, phrases
+
+
+def _compact_tables(loc_root: Path, source: str, target: str) -> object:
+    loc = i18n.Localisation(loc_root)
+    rev_en = loc.reverse_map(source)
+    phrases = loc.official_phrases(source, target)
+    return loc, rev_en, phrases
+
+
+def _measure(label: str, fn, *args) -> None:
+    gc.collect()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    held = fn(*args)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    print(
+        f"{label:<8} peak {(peak - base) / 2**20:8.1f} MiB  "
+        f"retained {(current - base) / 2**20:8.1f} MiB  {elapsed:6.2f}s"
+    )
+    del held
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare peak memory of dict-based and compact localisation tables."
+    )
+    parser.add_argument(
+        "--stellaris-dir",
+        type=Path,
+        default=None,
+        help="Path to Stellaris install directory (default: auto-detect Steam install).",
+    )
+    parser.add_argument("--source", default="english", help="Source language (default: english).")
+    parser.add_argument("--target", default="simp_chinese", help="Target language (default: simp_chinese).")
+    args = parser.parse_args()
+
+    try:
+        loc_root = i18n.Localisation.discover(args.stellaris_dir).root
+    except i18n.BuildError as e:
+        i18n._eprint(e)
+        return 2
+
+    raw = sum(
+        yml.stat().st_size
+        for language in (args.source, args.target)
+        for yml in i18n._iter_localisation_files(loc_root / language)
+    )
+    print(f"Localisation: {loc_root} ({raw / 2**20:.1f} MiB of yml)")
+
+    tracemalloc.start()
+    _measure("dict", _dict_tables, loc_root, args.source, args.target)
+    _measure("compact", _compact_tables, loc_root, args.source, args.target)
+    # The reverse map on its own, over an already loaded source table.
+    table = i18n.Localisation(loc_root).table(args.source)
+    _measure("rev dict", i18n._build_reverse_value_map, table)
+    _measure("rev idx", ReverseIndex, table)
+    tracemalloc.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
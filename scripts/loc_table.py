@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+
+
+class LocTable(Mapping):
+    """Read-only ``key -> text`` table stored compactly.
+
+    Keys are interned and kept in insertion order; all values live in one
+    UTF-8 buffer addressed by an offset array, and lookups bisect a sorted
+    key index instead of hashing through a dict. Iteration order matches a dict
+    built by updating with the same pairs (first position, last value wins).
+    """
+
+    __slots__ = ("_keys", "_offsets", "_buf", "_sorted_keys", "_order")
+
+    def __init__(self, keys: list[str], offsets: array, buf: bytearray) -> None:
+        self._keys = keys
+        self._offsets = offsets
+        self._buf = buf
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._sorted_keys = [keys[i] for i in order]
+        self._order = array("I", order)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, str]]) -> LocTable:
+        # Values are encoded straight into the buffer; the position dict only
+        # lives while building and handles "first position, last value wins".
+        positions: dict[str, int] = {}
+        keys: list[str] = []
+        starts = array("I")
+        ends = array("I")
+        buf = bytearray()
+        duplicates = False
+        for key, value in pairs:
+            start = len(buf)
+            buf += value.encode("utf-8")
+            pos = positions.get(key)
+            if pos is None:
+                positions[key] = len(keys)
+                keys.append(sys.intern(key))
+                starts.append(start)
+                ends.append(len(buf))
+            else:
+                starts[pos] = start
+                ends[pos] = len(buf)
+                duplicates = True
+        del positions
+
+        offsets = array("I", [0])
+        if not duplicates:
+            offsets.extend(ends)
+            return cls(keys, offsets, buf)
+
+        # Overridden values left dead bytes behind; repack in key order.
+        packed = bytearray()
+        for start, end in zip(starts, ends):
+            packed += buf[start:end]
+            offsets.append(len(packed))
+        return cls(keys, offsets, packed)
+
+    @classmethod
+    def merge(cls, tables: Iterable[LocTable]) -> LocTable:
+        return cls.from_pairs(pair for table in tables for pair in table.items())
+
+    def _index(self, key: str) -> int:
+        sorted_keys = self._sorted_keys
+        pos = bisect_left(sorted_keys, key)
+        if pos < len(sorted_keys) and sorted_keys[pos] == key:
+            return self._order[pos]
+        return -1
+
+    def value_bytes(self, index: int) -> bytearray:
+        return self._buf[self._offsets[index]:self._offsets[index + 1]]
+
+    def value_checksums(self) -> array:
+        """CRC-32 of every value in table order, computed without copying them."""
+        offsets = self._offsets
+        with memoryview(self._buf) as view:
+            return array("I", (zlib.crc32(view[offsets[i]:offsets[i + 1]]) for i in range(len(self._keys))))
+
+    def value_at(self, index: int) -> str:
+        return self.value_bytes(index).decode("utf-8")
+
+    def key_at(self, index: int) -> str:
+        return self._keys[index]
+
+    def __getitem__(self, key: str) -> str:
+        index = self._index(key)
+        if index < 0:
+            raise KeyError(key)
+        return self.value_at(index)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._index(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        for index, key in enumerate(self._keys):
+            yield key, self.value_at(index)
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        h.update("\0".join(self._keys).encode("utf-8"))
+        h.update(self._offsets.tobytes())
+        h.update(self._buf)
+        return h.hexdigest()
+
+
+class ReverseIndex:
+    """``text -> first key`` lookup over a LocTable, kept as a sorted hash index.
+
+    Equivalent to ``{value: key}`` built in table order with the first key
+    winning, without materialising a second dict of every string: only the
+    CRC-32 and table position of each value are stored, and a lookup bisects
+    the hashes and compares the few candidates byte for byte.
+    """
+
+    __slots__ = ("_table", "_hashes", "_order")
+
+    def __init__(self, table: LocTable) -> None:
+        self._table = table
+        # hash << 32 | position sorts by hash, then table order, so the first
+        # match in a run of equal hashes is the first key with that text.
+        packed = sorted(crc << 32 | i for i, crc in enumerate(table.value_checksums()))
+        self._hashes = array("I", (p >> 32 for p in packed))
+        self._order = array("I", (p & 0xFFFFFFFF for p in packed))
+
+    def get(self, value: str, default: str | None = None) -> str | None:
+        data = value.encode("utf-8")
+        crc = zlib.crc32(data)
+        hashes = self._hashes
+        pos = bisect_left(hashes, crc)
+        while pos < len(hashes) and hashes[pos] == crc:
+            index = self._order[pos]
+            if self._table.value_bytes(index) == data:
+                return self._table.key_at(index)
+            pos += 1
+        return default
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, str) and self.get(value) is not None
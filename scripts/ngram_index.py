@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import re
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from heapq import nlargest
+
+from loc_table import LocTable
+
+_MARKUP_RE = re.compile(r"<[^>]*>|£\w+£|§.|\$[^$\s]*\$|\[[^\]]*\]|\\n")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def strip_markup(text: str) -> str:
+    """``text`` without tags, icons, colour codes, ``$references$`` or ``[scopes]``."""
+    return _MARKUP_RE.sub(" ", text)
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD_RE.sub(" ", strip_markup(text).lower()).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f" {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)} if len(padded) > 2 else set()
+
+
+class TrigramIndex:
+    """Character-trigram inverted index over the values of a LocTable.
+
+    Only distinct texts with a counterpart in ``target`` are indexed, each
+    under its first key. A lookup counts shared trigrams over the rarest
+    posting lists first, stopping at ``budget`` postings, and rescores the
+    best candidates by exact Dice similarity; frequent trigrams such as
+    " th" only take part when the query has nothing rarer.
+    """
+
+    __slots__ = ("_source", "_docs", "_sizes", "_postings")
+
+    def __init__(self, source: LocTable, target: Mapping[str, str] | None = None, max_length: int = 300) -> None:
+        self._source = source
+        self._docs = array("I")
+        self._sizes = array("I")
+        postings: dict[str, array] = {}
+        seen: set[str] = set()
+        for index in range(len(source)):
+            text = source.value_at(index)
+            if not text or len(text) > max_length or text in seen:
+                continue
+            if target is not None and source.key_at(index) not in target:
+                continue
+            seen.add(text)
+            grams = trigrams(text)
+            if not grams:
+                continue
+            doc = len(self._docs)
+            self._docs.append(index)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(doc)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(
+        self,
+        text: str,
+        limit: int = 5,
+        min_score: float = 0.3,
+        budget: int = 20000,
+        candidates: int = 64,
+    ) -> list[tuple[float, str]]:
+        """Return up to ``limit`` ``(score, key)`` pairs, best first."""
+        grams = trigrams(text)
+        if not grams:
+            return []
+        lists = sorted((self._postings[g] for g in grams if g in self._postings), key=len)
+        counts: Counter[int] = Counter()
+        used = 0
+        for posting in lists:
+            if used and used + len(posting) > budget:
+                break
+            counts.update(posting)
+            used += len(posting)
+
+        size = len(grams)
+        sizes = self._sizes
+        best = nlargest(candidates, counts.items(), key=lambda item: item[1] / (size + sizes[item[0]]))
+        scored = []
+        for doc, _ in best:
+            other = trigrams(self._source.value_at(self._docs[doc]))
+            score = 2 * len(grams & other) / (size + len(other))
+            if score >= min_score:
+                scored.append((score, doc))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(score, self._source.key_at(self._docs[doc])) for score, doc in scored[:limit]]
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import build_phoenix_i18n as i18n
+from condition_tree import MULTIPLIER_RE, UNLOCK_RE, parse_condition
+from ngram_index import TrigramIndex, strip_markup
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+
+
+def _words(text: str) -> set[str]:
+    # All-caps tokens (AI, DLC, III) are kept as-is by the rules.
+    return {word.casefold() for word in _WORD_RE.findall(strip_markup(text)) if not word.isupper()}
+
+
+def _untranslated(source: str, translated: str) -> bool:
+    """Whether ``translated`` still carries words of its English ``source``.
+
+    Comparing against the source rather than by script works for Latin-script
+    targets too, where every translated line is full of letters.
+    """
+    return bool(_words(source) & _words(translated))
+
+
+def _query_text(fragment: str) -> str:
+    fragment = MULTIPLIER_RE.sub("", fragment)
+    m = UNLOCK_RE.match(fragment)
+    return m.group(2) if m else fragment.strip()
+
+
+def _untranslated_fragments(raw_line: str, translated: str | None) -> list[str]:
+    """English fragments of ``raw_line`` whose translation is missing or still mixed."""
+    condition = parse_condition(raw_line)
+    if condition is None:
+        return [raw_line]
+    nodes = [node for node in condition.root.walk() if not node.is_operator]
+    done = parse_condition(translated) if translated is not None else None
+    if done is not None:
+        done_nodes = list(done.root.walk())
+        if len(done_nodes) == len(list(condition.root.walk())):
+            pairs = zip(condition.root.walk(), done_nodes)
+            return [node.text for node, out in pairs if not node.is_operator and _untranslated(node.text, out.text)]
+    return [node.text for node in nodes]
+
+
+def _code(text: str) -> str:
+    text = text.replace("\n", "\\n").replace("\t", "\\t")
+    return f"`` {text} ``" if "`" in text else f"`{text}`"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Suggest official localisation strings for tech lines the rules leave untranslated."
+    )
+    parser.add_argument(
+        "--version",
+        default="phoenix-4.0.10",
+        help="Version directory name (default: phoenix-4.0.10).",
+    )
+    parser.add_argument(
+        "--stellaris-dir",
+        default=None,
+        help="Optional Stellaris install directory. If omitted, auto-detect from Steam.",
+    )
+    parser.add_argument(
+        "--locale",
+        default="zh-hans",
+        help="Target locale (default: zh-hans).",
+    )
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Report path (default: <version dir>/translation-suggestions.<locale>.md).",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=5,
+        help="Suggestions per fragment (default: 5).",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=0.4,
+        help="Minimum trigram Dice similarity, 0-1 (default: 0.4).",
+    )
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    version_dir = repo_root / args.version
+    if not version_dir.exists():
+        print(f"ERROR: version directory not found: {version_dir}", file=sys.stderr)
+        return 2
+
+    try:
+        localisation = i18n.Localisation.discover(Path(args.stellaris_dir) if args.stellaris_dir else None)
+        builder = i18n.Builder.for_locale(localisation, args.locale)
+        version = i18n.VersionData.load(version_dir, args.version)
+        result = builder.build(version)
+    except i18n.BuildError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    source = localisation.table(builder.source)
+    target = localisation.table(builder.target)
+    resolve_target_text = localisation.resolve_text(builder.target)
+
+    started = time.perf_counter()
+    index = TrigramIndex(source, target)
+    index_seconds = time.perf_counter() - started
+
+    all_lines = i18n._collect_lines(version.nodes)
+    entries = []
+    lookups = 0
+    lookup_seconds = 0.0
+    for raw_line in sorted(all_lines):
+        translated = result.line.get(raw_line)
+        if translated is not None and not _untranslated(raw_line, translated):
+            continue
+        fragments = []
+        for fragment in _untranslated_fragments(raw_line, translated):
+            started = time.perf_counter()
+            hits = index.search(_query_text(fragment), limit=args.limit, min_score=args.min_score)
+            lookup_seconds += time.perf_counter() - started
+            lookups += 1
+            fragments.append((fragment, hits))
+        best = max((hits[0][0] for _, hits in fragments if hits), default=0.0)
+        entries.append((best, raw_line, translated, fragments))
+    entries.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    missing = sum(1 for entry in entries if entry[2] is None)
+    out = [
+        f"# Translation suggestions: {args.version} ({args.locale})",
+        "",
+        f"Untranslated lines: {len(entries)} / {len(all_lines)} "
+        f"({missing} missing, {len(entries) - missing} mixed). "
+        f"Ranked by the best trigram similarity to an official {builder.source} string.",
+        "",
+    ]
+    for number, (best, raw_line, translated, fragments) in enumerate(entries, 1):
+        out.append(f"## {number}. {_code(raw_line)}")
+        out.append("")
+        out.append(f"Current: {_code(translated) if translated is not None else '(none)'}")
+        out.append("")
+        for fragment, hits in fragments:
+            out.append(f"- {_code(fragment)}")
+            if not hits:
+                out.append("  - (no suggestion)")
+            for score, key in hits:
+                out.append(
+                    f"  - {score:.2f} {_code(key)}: {_code(source[key])} → "
+                    f"{_code(resolve_target_text(target[key]))}"
+                )
+        out.append("")
+
+    out_path = Path(args.out) if args.out else version_dir / f"translation-suggestions.{args.locale}.md"
+    out_path.write_text("\n".join(out), encoding="utf-8")
+    print(f"Written: {out_path}")
+    print(f"Untranslated lines: {len(entries)} / {len(all_lines)} ({missing} missing)")
+    print(f"Index: {len(index)} strings in {index_seconds:.2f}s")
+    if lookups:
+        print(f"Lookups: {lookups}, {1000 * lookup_seconds / lookups:.2f} ms each")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
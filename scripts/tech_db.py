@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from versions import LINE_FIELDS, VERSION_AREA_FILE, find_versions, game_version, i18n_file_name, sort_key
+
+_DB_NAME = "tech-tree.sqlite3"
+_TREES = ("physics", "society", "engineering", "anomalies")
+
+# Bump when the schema or the export below changes, so every version is re-exported.
+_EXPORT_FORMAT = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    game_version TEXT,
+    sort_key INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS techs (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id) ON DELETE CASCADE,
+    tree TEXT NOT NULL,
+    key TEXT NOT NULL,
+    area TEXT,
+    name TEXT,
+    description TEXT,
+    category TEXT,
+    tier INTEGER,
+    cost REAL,
+    base_weight REAL,
+    base_factor REAL,
+    is_dangerous INTEGER,
+    is_rare INTEGER,
+    is_start_tech INTEGER,
+    is_event INTEGER,
+    source TEXT,
+    UNIQUE (version_id, tree, key)
+);
+CREATE INDEX IF NOT EXISTS techs_key ON techs (key);
+CREATE TABLE IF NOT EXISTS prerequisites (
+    tech_id INTEGER NOT NULL REFERENCES techs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    prerequisite TEXT NOT NULL,
+    PRIMARY KEY (tech_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prerequisites_key ON prerequisites (prerequisite);
+CREATE TABLE IF NOT EXISTS lines (
+    tech_id INTEGER NOT NULL REFERENCES techs(id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (tech_id, field, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lines_raw ON lines (raw);
+CREATE TABLE IF NOT EXISTS translations (
+    version_id INTEGER NOT NULL REFERENCES versions(id) ON DELETE CASCADE,
+    locale TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (version_id, locale, kind, source)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS tech_text USING fts5(
+    name, description, locale UNINDEXED, tech_id UNINDEXED, tokenize = 'trigram'
+);
+"""
+
+_CHANGE_COLUMNS = ("tree", "category", "tier", "cost", "base_weight", "base_factor")
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def _version_files(version_dir: Path) -> list[Path]:
+    files = [version_dir / f"{tree}.json" for tree in _TREES]
+    files = [p for p in files if p.exists()]
+    return files + sorted(version_dir.glob(i18n_file_name("*")))
+
+
+def _digest(files: list[Path]) -> str:
+    h = hashlib.sha256(_EXPORT_FORMAT.encode("utf-8"))
+    for p in files:
+        h.update(p.name.encode("utf-8") + b"\0")
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def _iter_tree(tree: str, data) -> list[dict]:
+    if tree == "anomalies":
+        return [node for node in data if node.get("key")]
+    out = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if node.get("key"):
+            out.append(node)
+        stack.extend(reversed(node.get("children") or []))
+    return out
+
+
+def _like_pattern(text: str) -> str:
+    return "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _flag(value) -> int | None:
+    return None if value is None else int(bool(value))
+
+
+class TechDatabase:
+    """SQLite export of the version trees, their lines and their i18n payloads.
+
+    Each version is stored with a digest of its tree and i18n files and is
+    only rewritten when that digest changes. Tech names and descriptions, in
+    English and every exported locale, are indexed in the ``tech_text`` FTS5
+    table with the trigram tokenizer, so substring searches work for Chinese
+    as well as English.
+    """
+
+    def __init__(self, path: Path, readonly: bool = False) -> None:
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(_SCHEMA)
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def versions(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT name FROM versions ORDER BY sort_key, name")]
+
+    def _delete_version(self, version_id: int) -> None:
+        self.conn.execute(
+            "DELETE FROM tech_text WHERE tech_id IN (SELECT id FROM techs WHERE version_id = ?)",
+            (version_id,),
+        )
+        self.conn.execute("DELETE FROM versions WHERE id = ?", (version_id,))
+
+    def remove(self, name: str) -> bool:
+        row = self.conn.execute("SELECT id FROM versions WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return False
+        with self.conn:
+            self._delete_version(row[0])
+        return True
+
+    def export_version(self, repo_root: Path, name: str, force: bool = False) -> bool:
+        """Write one version directory; returns False when it was already up to date."""
+        version_dir = repo_root / name
+        files = _version_files(version_dir)
+        digest = _digest(files)
+        row = self.conn.execute("SELECT id, digest FROM versions WHERE name = ?", (name,)).fetchone()
+        if row is not None and row[1] == digest and not force:
+            return False
+
+        number = game_version(repo_root, name)
+        conn = self.conn
+        with conn:
+            if row is not None:
+                self._delete_version(row[0])
+            version_id = conn.execute(
+                "INSERT INTO versions (name, game_version, sort_key, digest) VALUES (?, ?, ?, ?)",
+                (name, number, sort_key(number), digest),
+            ).lastrowid
+
+            tech_ids: dict[str, int] = {}
+            for tree in _TREES:
+                path = version_dir / f"{tree}.json"
+                if not path.exists():
+                    continue
+                for node in _iter_tree(tree, json.loads(path.read_text(encoding="utf-8"))):
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO techs (version_id, tree, key, area, name, description, category, "
+                        "tier, cost, base_weight, base_factor, is_dangerous, is_rare, is_start_tech, is_event, "
+                        "source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            version_id, tree, node["key"], node.get("area"), node.get("name"),
+                            node.get("description"), node.get("category"), node.get("tier"), node.get("cost"),
+                            node.get("base_weight"), node.get("base_factor"), _flag(node.get("is_dangerous")),
+                            _flag(node.get("is_rare")), _flag(node.get("is_start_tech")),
+                            _flag(node.get("is_event")), node.get("source"),
+                        ),
+                    )
+                    if not cur.rowcount:
+                        continue
+                    tech_id = cur.lastrowid
+                    tech_ids.setdefault(node["key"], tech_id)
+                    conn.executemany(
+                        "INSERT INTO prerequisites (tech_id, position, prerequisite) VALUES (?, ?, ?)",
+                        ((tech_id, i, p) for i, p in enumerate(node.get("prerequisites") or [])),
+                    )
+                    conn.executemany(
+                        "INSERT INTO lines (tech_id, field, position, raw) VALUES (?, ?, ?, ?)",
+                        (
+                            (tech_id, field, i, raw)
+                            for field in LINE_FIELDS
+                            for i, raw in enumerate(node.get(field) or [])
+                        ),
+                    )
+                    conn.execute(
+                        "INSERT INTO tech_text (name, description, locale, tech_id) VALUES (?, ?, 'en', ?)",
+                        (node.get("name") or "", node.get("description") or "", tech_id),
+                    )
+
+            for path in files:
+                if not path.name.startswith("i18n."):
+                    continue
+                locale = path.name[len("i18n."):-len(".json")]
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                rows = []
+                for key, entry in (payload.get("tech") or {}).items():
+                    for kind in ("name", "description"):
+                        if entry.get(kind):
+                            rows.append((version_id, locale, kind, key, entry[kind]))
+                    if key in tech_ids:
+                        conn.execute(
+                            "INSERT INTO tech_text (name, description, locale, tech_id) VALUES (?, ?, ?, ?)",
+                            (entry.get("name") or "", entry.get("description") or "", locale, tech_ids[key]),
+                        )
+                for kind in ("category", "line"):
+                    rows.extend(
+                        (version_id, locale, kind, source, text)
+                        for source, text in (payload.get(kind) or {}).items()
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translations (version_id, locale, kind, source, text) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return True
+
+    def search(self, term: str, version: str | None = None, limit: int = 50, locale: str = "zh-hans") -> list[tuple]:
+        """Techs whose English or ``locale`` name or description contains ``term``.
+
+        Each tech is listed once, with its ``locale`` name (English when untranslated).
+        """
+        if len(term) >= 3:
+            match = "tech_text MATCH ?"
+            match_params: list = ['"' + term.replace('"', '""') + '"']
+        else:
+            # The trigram index cannot serve terms shorter than three characters.
+            match = "(tech_text.name LIKE ? ESCAPE '\\' OR tech_text.description LIKE ? ESCAPE '\\')"
+            match_params = [_like_pattern(term), _like_pattern(term)]
+        where = f"techs.id IN (SELECT tech_id FROM tech_text WHERE {match} AND tech_text.locale IN ('en', ?))"
+        params: list = [locale, *match_params, locale]
+        if version is not None:
+            where += " AND versions.name = ?"
+            params.append(version)
+        params.append(limit)
+        return self.conn.execute(
+            "SELECT versions.name, techs.tree, techs.key, COALESCE(translations.text, techs.name) "
+            "FROM techs JOIN versions ON versions.id = techs.version_id "
+            "LEFT JOIN translations ON translations.version_id = techs.version_id "
+            "AND translations.locale = ? AND translations.kind = 'name' AND translations.source = techs.key "
+            f"WHERE {where} ORDER BY versions.sort_key DESC, versions.name, techs.key LIMIT ?",
+            params,
+        ).fetchall()
+
+    def history(self, key: str, locale: str = "zh-hans") -> list[tuple]:
+        """One row per version containing ``key``, oldest first."""
+        return self.conn.execute(
+            "SELECT versions.name, techs.tree, techs.category, techs.tier, techs.cost, techs.base_weight, "
+            "techs.base_factor, techs.name, translations.text "
+            "FROM techs JOIN versions ON versions.id = techs.version_id "
+            "LEFT JOIN translations ON translations.version_id = techs.version_id "
+            "AND translations.locale = ? AND translations.kind = 'name' AND translations.source = techs.key "
+            "WHERE techs.key = ? ORDER BY versions.sort_key, versions.name, techs.tree",
+            (locale, key),
+        ).fetchall()
+
+    def lines(
+        self, text: str, field: str | None = None, version: str | None = None, locale: str = "zh-hans"
+    ) -> list[tuple]:
+        """Tech lines containing ``text`` (case-insensitive), with their translation."""
+        where = "lines.raw LIKE ? ESCAPE '\\'"
+        params: list = [locale, _like_pattern(text)]
+        if field is not None:
+            where += " AND lines.field = ?"
+            params.append(field)
+        if version is not None:
+            where += " AND versions.name = ?"
+            params.append(version)
+        return self.conn.execute(
+            "SELECT versions.name, techs.key, lines.field, lines.raw, translations.text "
+            "FROM lines JOIN techs ON techs.id = lines.tech_id "
+            "JOIN versions ON versions.id = techs.version_id "
+            "LEFT JOIN translations ON translations.version_id = techs.version_id "
+            "AND translations.locale = ? AND translations.kind = 'line' AND translations.source = lines.raw "
+            f"WHERE {where} ORDER BY versions.sort_key DESC, versions.name, techs.key, lines.field, lines.position",
+            params,
+        ).fetchall()
+
+
+def _format(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value == int(value):
+        return str(int(value))
+    return str(value).replace("\n", "\\n").replace("\t", "\\t")
+
+
+def _print_rows(rows, started: float) -> None:
+    for row in rows:
+        print("\t".join(_format(v) for v in row))
+    _eprint(f"({len(rows)} rows, {1000 * (time.perf_counter() - started):.1f} ms)")
+
+
+def _print_history(rows, started: float) -> None:
+    previous = None
+    for row in rows:
+        changes = []
+        if previous is not None:
+            for i, column in enumerate(_CHANGE_COLUMNS, 1):
+                if row[i] != previous[i]:
+                    changes.append(f"{column} {_format(previous[i])}->{_format(row[i])}")
+        print("\t".join(_format(v) for v in row) + ("\t" + "; ".join(changes) if changes else ""))
+        previous = row
+    _eprint(f"({len(rows)} versions, {1000 * (time.perf_counter() - started):.1f} ms)")
+
+
+def _export(db: TechDatabase, repo_root: Path, versions: list[str] | None, force: bool) -> int:
+    names = versions or find_versions(repo_root)
+    for name in names:
+        if not (repo_root / name / VERSION_AREA_FILE).exists():
+            _eprint(f"ERROR: version directory not found: {repo_root / name}")
+            return 2
+    written = 0
+    for name in names:
+        started = time.perf_counter()
+        if db.export_version(repo_root, name, force):
+            written += 1
+            print(f"Exported: {name} ({time.perf_counter() - started:.2f}s)")
+        else:
+            print(f"Unchanged: {name}")
+    if versions is None:
+        for name in sorted(set(db.versions()) - set(names)):
+            db.remove(name)
+            written += 1
+            print(f"Removed: {name}")
+    if written:
+        with db.conn:
+            db.conn.execute("INSERT INTO tech_text (tech_text) VALUES ('optimize')")
+    print(f"Written: {db.path} ({written} / {len(names)} versions exported)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Export every version, tech, line and translation into SQLite and query it."
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help=f"Database path (default: {_DB_NAME} in the repository root).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export version directories; unchanged versions are skipped.")
+    export.add_argument(
+        "--version",
+        nargs="+",
+        default=None,
+        help="Version directory name(s) (default: every version directory; versions no longer on disk are removed).",
+    )
+    export.add_argument("--force", action="store_true", help="Re-export versions even if unchanged.")
+
+    search = commands.add_parser("search", help="Full-text search over tech names and descriptions.")
+    search.add_argument("term")
+    search.add_argument("--version", default=None, help="Only this version.")
+    search.add_argument("--limit", type=int, default=50, help="Maximum rows (default: 50).")
+    search.add_argument(
+        "--locale", default="zh-hans", help="Locale searched besides English and shown (default: zh-hans)."
+    )
+
+    tech = commands.add_parser("tech", help="A tech across versions, with the fields that changed.")
+    tech.add_argument("key")
+    tech.add_argument("--locale", default="zh-hans", help="Locale of the translated name (default: zh-hans).")
+
+    lines = commands.add_parser("lines", help="Techs whose unlock, potential or weight lines contain a text.")
+    lines.add_argument("text")
+    lines.add_argument("--field", choices=LINE_FIELDS, default=None)
+    lines.add_argument("--version", default=None, help="Only this version.")
+    lines.add_argument("--locale", default="zh-hans", help="Locale of the translated line (default: zh-hans).")
+
+    sql = commands.add_parser("sql", help="Run a read-only SQL query.")
+    sql.add_argument("query")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    db_path = args.db if args.db is not None else repo_root / _DB_NAME
+    if args.command == "export":
+        db = TechDatabase(db_path)
+        try:
+            return _export(db, repo_root, args.version, args.force)
+        finally:
+            db.close()
+
+    if not db_path.exists():
+        _eprint(f"ERROR: database not found: {db_path} (run the export command first)")
+        return 2
+    db = TechDatabase(db_path, readonly=True)
+    started = time.perf_counter()
+    try:
+        if args.command == "search":
+            _print_rows(db.search(args.term, args.version, args.limit, args.locale), started)
+        elif args.command == "tech":
+            _print_history(db.history(args.key, args.locale), started)
+        elif args.command == "lines":
+            _print_rows(db.lines(args.text, args.field, args.version, args.locale), started)
+        else:
+            _print_rows(db.conn.execute(args.query).fetchall(), started)
+    except sqlite3.Error as e:
+        _eprint(f"ERROR: {e}")
+        return 2
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,52 +2,105 @@
 from __future__ import annotations
 
 import argparse
-import subprocess
 import sys
 from pathlib import Path
 
+import build_phoenix_i18n as i18n
+import build_tooltips
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(
-        description="One-command Chinese i18n generation for a Stellaris tech-tree version."
+        description="One-command Chinese i18n generation for Stellaris tech-tree versions."
     )
     parser.add_argument(
         "--version",
-        default="phoenix-4.0.10",
-        help="Version directory name (default: phoenix-4.0.10).",
+        nargs="+",
+        default=["phoenix-4.0.10"],
+        help="Version directory name(s) (default: phoenix-4.0.10).",
     )
     parser.add_argument(
         "--stellaris-dir",
         default=None,
         help="Optional Stellaris install directory. If omitted, auto-detect from Steam.",
     )
+    parser.add_argument(
+        "--locales",
+        nargs="+",
+        default=["zh-hans"],
+        help="Target locale(s), built in parallel; writes i18n.<locale>.json (default: zh-hans).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Maximum worker processes for --locales, or for line translation of a single locale (default: CPU count).",
+    )
+    parser.add_argument(
+        "--memory",
+        default=None,
+        help="Translation memory database (default: translation-memory.sqlite3 in the user config directory).",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Translate every line without reading or writing the translation memory.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep localisation loaded and rebuild whenever version JSON, localisation or rules change.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds for --watch (default: 0.5).",
+    )
     args = parser.parse_args()
 
     repo_root = Path(__file__).resolve().parents[1]
-    build_script = repo_root / "scripts" / "build_phoenix_i18n.py"
 
-    version_dir = repo_root / args.version
-    if not version_dir.exists():
-        print(f"ERROR: version directory not found: {version_dir}", file=sys.stderr)
+    for version in args.version:
+        version_dir = repo_root / version
+        if not version_dir.exists():
+            print(f"ERROR: version directory not found: {version_dir}", file=sys.stderr)
+            return 2
+    if args.watch and (len(args.version) != 1 or len(args.locales) != 1):
+        print("ERROR: --watch takes exactly one --version and one --locales.", file=sys.stderr)
+        return 2
+
+    try:
+        # Fail before translating if the tooltip template uses syntax build_tooltips cannot render.
+        build_tooltips.load_template(repo_root)
+        localisation = i18n.Localisation.discover(
+            Path(args.stellaris_dir) if args.stellaris_dir else None,
+            keep_files=args.watch,
+        )
+        if args.watch:
+            from i18n_watch import watch
+
+            return watch(localisation, repo_root / args.version[0], args.version[0], args.interval, args.locales[0])
+
+        versions = [i18n.VersionData.load(repo_root / version, version) for version in args.version]
+        memory = None
+        if not args.no_memory:
+            memory = i18n.TranslationMemory(Path(args.memory) if args.memory else i18n.default_memory_path())
+        results = i18n.build_locales(localisation, versions, args.locales, args.jobs, memory)
+    except i18n.BuildError as e:
+        print(e, file=sys.stderr)
         return 2
 
-    out_path = version_dir / "i18n.zh-hans.json"
-    cmd = [
-        sys.executable,
-        str(build_script),
-        "--phoenix-dir",
-        args.version,
-        "--out",
-        str(Path(args.version) / "i18n.zh-hans.json"),
-    ]
-    if args.stellaris_dir:
-        cmd.extend(["--stellaris-dir", args.stellaris_dir])
-
-    result = subprocess.run(cmd, cwd=repo_root)
-    if result.returncode != 0:
-        return result.returncode
-
-    print(f"Done: {out_path}")
+    for locale, locale_results in results.items():
+        for result in locale_results:
+            out_path = repo_root / result.version / i18n.i18n_file_name(locale)
+            i18n._write_payload(out_path, result.payload())
+            build_tooltips.write_tooltips(repo_root / result.version, locale, result.payload())
+            print(f"Written: {out_path} (+ {build_tooltips.tooltip_file_name(locale)})")
+            if len(results) == 1:
+                result.print_summary()
+    if len(results) > 1:
+        i18n.print_coverage(results)
     return 0
 
 
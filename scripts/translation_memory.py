@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    fingerprint TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (fingerprint, rules)
+);
+CREATE TABLE IF NOT EXISTS lines (
+    raw TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    phrases TEXT NOT NULL,
+    translated TEXT,
+    PRIMARY KEY (fingerprint, rules, raw, phrases)
+) WITHOUT ROWID;
+"""
+
+# Stay well below SQLite's host parameter limit.
+_BATCH = 500
+# (fingerprint, rules) generations kept per language pair, most recently used
+# first, so checkouts or branches with different rules can share one memory.
+KEEP_GENERATIONS = 8
+
+
+class TranslationMemory:
+    """SQLite cache of translated lines shared across versions and runs.
+
+    A line is keyed by its raw text, the fingerprint of the game localisation
+    it was translated against, the hash of the translation rules and the
+    digest of the version-specific phrase pairs that can affect it (empty for
+    most lines, so they are shared across versions). Lines of the last
+    ``KEEP_GENERATIONS`` localisation/rules combinations used for a language
+    pair are kept; older ones are evicted. ``None`` results are
+    stored too, so lines nothing can translate are not retried. The
+    connection is opened lazily and is not pickled, so builders carrying a
+    memory can be sent to worker processes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._current: set[tuple[str, str]] = set()
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "_conn": None, "_current": set()}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'fingerprints'").fetchone():
+                # Memories from before generations were tracked: their lines
+                # are not attributed to any generation, so start over.
+                with conn:
+                    conn.execute("DROP TABLE fingerprints")
+                    conn.execute("DROP TABLE IF EXISTS lines")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def use(self, source: str, target: str, fingerprint: str, rules: str) -> int:
+        """Mark a localisation/rules generation as used for a language pair and evict old ones.
+
+        Only generations beyond the ``KEEP_GENERATIONS`` most recently used
+        for the pair are dropped; returns the number of lines evicted.
+        """
+        if (fingerprint, rules) in self._current:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generations (fingerprint, rules, source, target, used) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, rules, source, target, time.time()),
+            )
+            stale = conn.execute(
+                "SELECT fingerprint, rules FROM generations WHERE source = ? AND target = ? "
+                "ORDER BY used DESC, rowid DESC LIMIT -1 OFFSET ?",
+                (source, target, KEEP_GENERATIONS),
+            ).fetchall()
+            evicted = 0
+            for old in stale:
+                evicted += conn.execute("DELETE FROM lines WHERE fingerprint = ? AND rules = ?", old).rowcount
+                conn.execute("DELETE FROM generations WHERE fingerprint = ? AND rules = ?", old)
+        self._current.add((fingerprint, rules))
+        return evicted
+
+    def get_many(self, phrases: Mapping[str, str], fingerprint: str, rules: str) -> dict[str, str | None]:
+        """Look up ``raw -> phrase digest`` entries; returns ``raw -> translation`` for hits."""
+        conn = self._connect()
+        raws = list(phrases)
+        found: dict[str, str | None] = {}
+        for i in range(0, len(raws), _BATCH):
+            batch = raws[i:i + _BATCH]
+            marks = ",".join("?" * len(batch))
+            for raw, digest, translated in conn.execute(
+                f"SELECT raw, phrases, translated FROM lines WHERE fingerprint = ? AND rules = ? "
+                f"AND raw IN ({marks})",
+                (fingerprint, rules, *batch),
+            ):
+                if phrases[raw] == digest:
+                    found[raw] = translated
+        return found
+
+    def put_many(
+        self, entries: Iterable[tuple[str, str, str | None]], fingerprint: str, rules: str
+    ) -> None:
+        """Store ``(raw, phrase digest, translation)`` entries."""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lines (raw, fingerprint, rules, phrases, translated) VALUES (?, ?, ?, ?, ?)",
+                ((raw, fingerprint, rules, digest, translated) for raw, digest, translated in entries),
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+# The three research trees, in page order; anomalies.json sits beside them.
+AREAS = ("physics", "society", "engineering")
+# A directory holding this file is a version directory.
+VERSION_AREA_FILE = "physics.json"
+# Tech fields holding lists of condition/unlock lines.
+LINE_FIELDS = ("feature_unlocks", "potential", "weight_modifiers")
+
+_GAME_VERSION_RE = re.compile(r"(\d+(?:\.\d+)+)$")
+
+
+def i18n_file_name(locale: str) -> str:
+    return f"i18n.{locale}.json"
+
+
+def find_versions(repo_root: Path) -> list[str]:
+    """Names of every version directory under ``repo_root``, alphabetically."""
+    return sorted(
+        p.name for p in repo_root.iterdir()
+        if p.is_dir() and (p / VERSION_AREA_FILE).exists()
+    )
+
+
+def game_version(repo_root: Path, name: str) -> str | None:
+    """Game version of a version directory (``"4.0.10"`` for ``phoenix-4.0.10``), if known."""
+    m = _GAME_VERSION_RE.search(name)
+    if m:
+        return m.group(1)
+    # Directories without a version suffix (vanilla) are named in the page's route table.
+    index = repo_root / "index.html"
+    if index.exists():
+        m = re.search(
+            rf"route:\s*'{re.escape(name)}',\s*title:\s*'[^']*?(\d+(?:\.\d+)+)",
+            index.read_text(encoding="utf-8"),
+        )
+        if m:
+            return m.group(1)
+    return None
+
+
+def sort_key(version: str | None) -> int:
+    """Orders game versions numerically; unknown versions sort first."""
+    if version is None:
+        return 0
+    parts = [int(p) for p in version.split(".")[:3]]
+    parts += [0] * (3 - len(parts))
+    return parts[0] * 1_000_000 + parts[1] * 1_000 + parts[2]
+
+
+def sorted_versions(repo_root: Path, names: list[str]) -> list[str]:
+    """``names`` oldest game version first."""
+    return sorted(names, key=lambda name: (sort_key(game_version(repo_root, name)), name))
+
+
+def iter_techs(version_dir: Path):
+    """Every tech of a version: each tree depth-first, then the anomalies."""
+    def walk(node: dict):
+        yield node
+        for child in node.get("children") or []:
+            yield from walk(child)
+
+    for area in AREAS:
+        data = json.loads((version_dir / f"{area}.json").read_text(encoding="utf-8"))
+        yield from walk(data)
+    anomalies = version_dir / "anomalies.json"
+    if anomalies.exists():
+        yield from json.loads(anomalies.read_text(encoding="utf-8"))